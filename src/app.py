@@ -1,5 +1,8 @@
-from tool_router import chat_with_mcp
+import startup  # Primero, para medir el arranque completo
 import asyncio
 
+# Se importa con medición para que el reporte incluya las importaciones inmediatas
+chat_with_mcp = startup.timed_import("tool_router").chat_with_mcp
+
 if __name__ == "__main__":
-    asyncio.run(chat_with_mcp())
\ No newline at end of file
+    asyncio.run(chat_with_mcp())
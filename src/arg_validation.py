@@ -0,0 +1,232 @@
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class ArgumentValidationError(ValueError):
+    """Argumentos inválidos para una herramienta; el mensaje indica la ruta del error"""
+
+def _path(path: str, key) -> str:
+    return f"{path}[{key}]" if isinstance(key, int) else f"{path}.{key}" if path else key
+
+def _type_checker(type_name: str) -> Callable[[Any, str], Any]:
+    """Devuelve un validador que comprueba (y convierte si es seguro) el tipo JSON"""
+    def fail(value, path):
+        raise ArgumentValidationError(f"'{path or 'argumentos'}' debe ser de tipo {type_name}, se recibió {type(value).__name__}: {value!r}")
+
+    if type_name == "string":
+        def check(value, path):
+            if isinstance(value, str):
+                return value
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value)
+            fail(value, path)
+    elif type_name == "integer":
+        def check(value, path):
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if isinstance(value, str):
+                try:
+                    return int(value.strip())
+                except ValueError:
+                    pass
+            fail(value, path)
+    elif type_name == "number":
+        def check(value, path):
+            if isinstance(value, str):
+                try:
+                    value = float(value.strip())
+                except ValueError:
+                    fail(value, path)
+            # NaN e infinito no son JSON válido (json.loads acepta "NaN"/"Infinity" y "1e400" da inf)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+                return value
+            fail(value, path)
+    elif type_name == "boolean":
+        def check(value, path):
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, str) and value.lower() in ("true", "false"):
+                return value.lower() == "true"
+            fail(value, path)
+    elif type_name == "array":
+        def check(value, path):
+            if isinstance(value, list):
+                return value
+            fail(value, path)
+    elif type_name == "object":
+        def check(value, path):
+            if isinstance(value, dict):
+                return value
+            fail(value, path)
+    elif type_name == "null":
+        def check(value, path):
+            if value is None:
+                return value
+            fail(value, path)
+    else:
+        def check(value, path):
+            return value
+    return check
+
+def compile_schema(schema: Optional[dict]) -> Callable[[Any, str], Any]:
+    """
+    Compila un JSON Schema (el subconjunto que usan los inputSchema de MCP) a una
+    función validador(valor, ruta) que devuelve el valor convertido o lanza
+    ArgumentValidationError.
+    """
+    if not isinstance(schema, dict) or not schema:
+        return lambda value, path: value
+
+    checks: List[Callable[[Any, str], Any]] = []
+
+    # anyOf/oneOf: se acepta la primera alternativa válida
+    alternatives = schema.get("anyOf") or schema.get("oneOf")
+    if alternatives:
+        compiled_alternatives = [compile_schema(alt) for alt in alternatives]
+
+        def check_alternatives(value, path):
+            errors = []
+            for validator in compiled_alternatives:
+                try:
+                    return validator(value, path)
+                except ArgumentValidationError as e:
+                    errors.append(str(e))
+            raise ArgumentValidationError(" / ".join(errors))
+        checks.append(check_alternatives)
+
+    type_spec = schema.get("type")
+    if isinstance(type_spec, list):
+        type_checks = [_type_checker(t) for t in type_spec]
+
+        def check_types(value, path):
+            for checker in type_checks:
+                try:
+                    return checker(value, path)
+                except ArgumentValidationError:
+                    continue
+            raise ArgumentValidationError(f"'{path or 'argumentos'}' debe ser de tipo {' o '.join(type_spec)}, se recibió {value!r}")
+        checks.append(check_types)
+    elif type_spec:
+        checks.append(_type_checker(type_spec))
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value, path):
+            if value not in allowed:
+                raise ArgumentValidationError(f"'{path}' debe ser uno de {allowed}, se recibió {value!r}")
+            return value
+        checks.append(check_enum)
+
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    if minimum is not None or maximum is not None:
+        def check_range(value, path):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if minimum is not None and value < minimum:
+                    raise ArgumentValidationError(f"'{path}' debe ser >= {minimum}, se recibió {value}")
+                if maximum is not None and value > maximum:
+                    raise ArgumentValidationError(f"'{path}' debe ser <= {maximum}, se recibió {value}")
+            return value
+        checks.append(check_range)
+
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+        def check_length(value, path):
+            if isinstance(value, str):
+                if min_length is not None and len(value) < min_length:
+                    raise ArgumentValidationError(f"'{path}' debe tener al menos {min_length} caracteres")
+                if max_length is not None and len(value) > max_length:
+                    raise ArgumentValidationError(f"'{path}' debe tener como máximo {max_length} caracteres")
+            return value
+        checks.append(check_length)
+
+    if "items" in schema and isinstance(schema["items"], dict):
+        item_validator = compile_schema(schema["items"])
+
+        def check_items(value, path):
+            if isinstance(value, list):
+                return [item_validator(item, _path(path, i)) for i, item in enumerate(value)]
+            return value
+        checks.append(check_items)
+
+    properties = schema.get("properties")
+    required = schema.get("required") or []
+    additional = schema.get("additionalProperties", True)
+    if properties or required or additional is False:
+        property_validators = {key: compile_schema(sub) for key, sub in (properties or {}).items()}
+        defaults = {key: sub["default"] for key, sub in (properties or {}).items()
+                    if isinstance(sub, dict) and "default" in sub}
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return value
+            missing = [key for key in required if key not in value]
+            if missing:
+                raise ArgumentValidationError(f"Faltan parámetros obligatorios en '{path or 'argumentos'}': {', '.join(missing)}")
+            if additional is False:
+                unknown = [key for key in value if key not in property_validators]
+                if unknown:
+                    raise ArgumentValidationError(
+                        f"Parámetros no permitidos en '{path or 'argumentos'}': {', '.join(unknown)}. "
+                        f"Permitidos: {', '.join(property_validators) or 'ninguno'}"
+                    )
+            result = dict(value)
+            for key, validator in property_validators.items():
+                if key in result:
+                    # Un null en un parámetro opcional equivale a omitirlo
+                    if result[key] is None and key not in required:
+                        del result[key]
+                        continue
+                    result[key] = validator(result[key], _path(path, key))
+            for key, default in defaults.items():
+                result.setdefault(key, default)
+            return result
+        checks.append(check_object)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value, path):
+        for check in checks:
+            value = check(value, path)
+        return value
+    return validate
+
+class ToolValidators:
+    """Validadores precompilados por herramienta, con estadísticas de uso"""
+
+    def __init__(self):
+        self.validators: Dict[str, Callable[[Any, str], Any]] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def add(self, tool_name: str, schema: Optional[dict]):
+        self.validators[tool_name] = compile_schema(schema)
+        self.stats.setdefault(tool_name, {"calls": 0, "rejected": 0, "time_ms": 0.0})
+
+    def validate(self, tool_name: str, args: Any) -> Tuple[Any, Optional[str]]:
+        """Devuelve (argumentos convertidos, None) o (argumentos originales, mensaje de error)"""
+        validator = self.validators.get(tool_name)
+        if validator is None:
+            return args, None
+        stats = self.stats[tool_name]
+        stats["calls"] += 1
+        t0 = time.perf_counter()
+        try:
+            if args is None:
+                args = {}
+            return validator(args, ""), None
+        except ArgumentValidationError as e:
+            stats["rejected"] += 1
+            return args, str(e)
+        finally:
+            stats["time_ms"] += (time.perf_counter() - t0) * 1000
+
+    def report(self) -> List[str]:
+        lines = []
+        for tool_name, stats in self.stats.items():
+            if stats["calls"]:
+                average_us = stats["time_ms"] * 1000 / stats["calls"]
+                lines.append(f"  {tool_name}: {int(stats['calls'])} llamadas, {int(stats['rejected'])} rechazadas, {average_us:.1f} µs promedio")
+        return lines
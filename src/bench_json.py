@@ -0,0 +1,74 @@
+"""
+Micro-benchmark de la serialización de resultados MCP.
+
+Reproduce lo que ocurre con cada resultado (decodificar el texto de la herramienta,
+escribir el log, medir el tamaño y armar el mensaje para el modelo) usando los
+payloads reales de logs/mcp_calls.txt, con el camino anterior (json + indent=2) y
+con fast_json.
+
+Uso: python src/bench_json.py [ruta_del_log] [repeticiones]
+"""
+import json
+import sys
+import time
+
+import fast_json
+
+def load_payloads(log_path: str):
+    """Un payload por herramienta (el más grande), como texto JSON tal cual lo envía el servidor"""
+    payloads = {}
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            tool_name = entry.get("tool", "")
+            if not tool_name or tool_name.isupper():
+                continue
+            text = json.dumps(entry.get("result"), ensure_ascii=False)
+            if len(text) > len(payloads.get(tool_name, "")):
+                payloads[tool_name] = text
+    return payloads
+
+def legacy_path(text: str):
+    result = json.loads(text)
+    log_entry = {"timestamp": "2025-01-01 00:00:00", "tool": "t", "parameters": {}, "result": result, "execution_time_ms": 1}
+    json.dumps(log_entry, ensure_ascii=False)
+    json.dumps(result, ensure_ascii=False)  # tamaño para decidir si se guarda aparte
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+def fast_path(text: str):
+    result = fast_json.loads(text)
+    # Se codifica una vez y el texto se reutiliza, igual que en execute_mcp_tool
+    result_json = fast_json.dumps(result)
+    log_entry = {"timestamp": "2025-01-01 00:00:00", "tool": "t", "parameters": {}, "result": result, "execution_time_ms": 1}
+    fast_json.dumps_with_fragments(log_entry, {"result": result_json})
+    len(result_json.encode("utf-8"))
+    return result_json
+
+def bench(func, text: str, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - t0) * 1000 / repeat
+
+def main():
+    log_path = sys.argv[1] if len(sys.argv) > 1 else "logs/mcp_calls.txt"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    payloads = load_payloads(log_path)
+
+    print(f"Backend: {fast_json.BACKEND}")
+    print(f"{'herramienta':<35}{'bytes':>10}{'anterior ms':>14}{'nuevo ms':>12}{'mejora':>9}")
+    total_legacy = total_fast = 0.0
+    for tool_name, text in sorted(payloads.items(), key=lambda item: -len(item[1])):
+        legacy_ms = bench(legacy_path, text, repeat)
+        fast_ms = bench(fast_path, text, repeat)
+        total_legacy += legacy_ms
+        total_fast += fast_ms
+        print(f"{tool_name:<35}{len(text.encode('utf-8')):>10}{legacy_ms:>14.3f}{fast_ms:>12.3f}{legacy_ms / fast_ms:>8.1f}x")
+    if total_fast:
+        print(f"{'TOTAL':<35}{'':>10}{total_legacy:>14.3f}{total_fast:>12.3f}{total_legacy / total_fast:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Mide el rendimiento del pool de réplicas del servidor Soccer MCP.
+
+Lanza muchas llamadas concurrentes a una herramienta con 1 réplica y con N réplicas,
+y muestra llamadas por segundo y cómo se repartieron. Usa la misma configuración que
+el chat (SOCCER_MCP_COMMAND / SOCCER_MCP_ARGS / SOCCER_MCP_CWD).
+
+Uso: python src/bench_pool.py <herramienta> [llamadas] [réplicas...] [--args JSON]
+     p. ej. python src/bench_pool.py get_competitions 40 1 2 4
+            python src/bench_pool.py get_team_by_id 40 1 2 --args '{"team_id": 81}'
+"""
+import asyncio
+import json
+import sys
+import time
+
+from mcp_client import server_params
+from replica_pool import StdioReplicaPool
+
+async def run(tool_name: str, args: dict, calls: int, replicas: int):
+    async with StdioReplicaPool(server_params, replicas) as pool:
+        await pool.call_tool(tool_name, args)  # calentamiento
+        t0 = time.perf_counter()
+        await asyncio.gather(*(pool.call_tool(tool_name, args) for _ in range(calls)))
+        elapsed = time.perf_counter() - t0
+        return elapsed, pool.peak_outstanding, [r["calls"] for r in pool.stats()]
+
+def parse_argv(argv):
+    """Separa --args JSON antes de leer los argumentos posicionales"""
+    argv = list(argv)
+    args = {}
+    if "--args" in argv:
+        position = argv.index("--args")
+        if position + 1 >= len(argv):
+            sys.exit("--args necesita un objeto JSON, p. ej. --args '{\"team_id\": 81}'")
+        args = json.loads(argv[position + 1])
+        del argv[position:position + 2]
+    tool_name = argv[0] if argv else "get_competitions"
+    calls = int(argv[1]) if len(argv) > 1 else 40
+    sizes = [int(n) for n in argv[2:]] or [1, 2, 4]
+    return tool_name, args, calls, sizes
+
+async def main():
+    tool_name, args, calls, sizes = parse_argv(sys.argv[1:])
+    baseline = None
+    for size in sizes:
+        elapsed, peak, per_replica = await run(tool_name, args, calls, size)
+        throughput = calls / elapsed
+        baseline = baseline or throughput
+        print(f"{size} réplica(s): {throughput:7.1f} llamadas/s ({throughput / baseline:.1f}x) "
+              f"pico {peak} en curso, reparto {per_replica}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import json
+from typing import Any, Dict
+
+# Backend opcional de alta velocidad: orjson si está instalado, si no la librería estándar
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+def loads(data):
+    """Decodifica JSON desde str o bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _default(obj):
+    # Modelos Pydantic que se hayan colado sin convertir
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Objeto de tipo {type(obj).__name__} no es serializable a JSON")
+
+def dumps(obj: Any) -> str:
+    """
+    Codifica a JSON compacto (UTF-8 sin escapar). No guarda nada en caché: quien necesite
+    la misma codificación varias veces debe conservar el texto y pasarlo explícitamente.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default).decode("utf-8")
+        except TypeError:
+            # orjson no acepta claves no-str ni enteros enormes; la librería estándar sí
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+def dumps_with_fragments(obj: Dict[str, Any], fragments: Dict[str, str]) -> str:
+    """
+    Codifica un dict en el que algunos valores ya vienen codificados: los de `fragments`
+    se insertan tal cual (p. ej. el resultado de una herramienta en la línea del log).
+    """
+    if not fragments:
+        return dumps(obj)
+    fields = [f"{dumps(str(key))}:{fragments[key] if key in fragments else dumps(value)}" for key, value in obj.items()]
+    return "{" + ",".join(fields) + "}"
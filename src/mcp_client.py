@@ -1,21 +1,36 @@
+from __future__ import annotations
+
 import os, json, shlex, time
 from contextlib import asynccontextmanager
-from typing import Tuple, List, Dict, Any
-import httpx
+from typing import Tuple, List, Dict, Any, TYPE_CHECKING
+
+from startup import timed_import
+load_dotenv = timed_import("dotenv").load_dotenv
+import fast_json
+from replica_pool import StdioReplicaPool, replicas_from_env
 
-from dotenv import load_dotenv
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp.client.session import ClientSession
+if TYPE_CHECKING:
+    from mcp.client.stdio import StdioServerParameters
 
 load_dotenv()
 
+# Importaciones diferidas: el SDK de MCP y httpx solo se cargan cuando se abre una sesión
+def _stdio():
+    return timed_import("mcp.client.stdio")
+
+def _client_session_cls():
+    return timed_import("mcp.client.session").ClientSession
+
+def _httpx():
+    return timed_import("httpx")
+
 def _from_env() -> StdioServerParameters | None:
     cmd = os.getenv("SOCCER_MCP_COMMAND")
     if not cmd:
         return None
     args = shlex.split(os.getenv("SOCCER_MCP_ARGS", ""))
     cwd = os.getenv("SOCCER_MCP_CWD") or None
-    return StdioServerParameters(command=cmd, args=args, cwd=cwd)
+    return _stdio().StdioServerParameters(command=cmd, args=args, cwd=cwd)
 
 def _from_env_op() -> StdioServerParameters | None:
     cmd = os.getenv("OP_MCP_COMMAND")
@@ -23,7 +38,7 @@ def _from_env_op() -> StdioServerParameters | None:
         return None
     args = shlex.split(os.getenv("OP_MCP_ARGS", ""))
     cwd = os.getenv("OP_MCP_CWD") or None
-    return StdioServerParameters(command=cmd, args=args, cwd=cwd)
+    return _stdio().StdioServerParameters(command=cmd, args=args, cwd=cwd)
 
 def _from_claude_config(preferred_key: str = "soccer-mcp") -> StdioServerParameters | None:
     appdata = os.getenv("APPDATA")
@@ -38,7 +53,7 @@ def _from_claude_config(preferred_key: str = "soccer-mcp") -> StdioServerParamet
         return None
     key = preferred_key if preferred_key in servers else next(iter(servers))
     s = servers[key]
-    return StdioServerParameters(
+    return _stdio().StdioServerParameters(
         command=s["command"],
         args=s.get("args", []),
         cwd=s.get("cwd")
@@ -70,11 +85,38 @@ def dump(obj: Any):
         return {k: dump(v) for k, v in obj.items()}
     return obj
 
+def tool_result_dict(result: Any) -> Dict[str, Any]:
+    """
+    Convierte un CallToolResult a dict leyendo solo los bloques de contenido. No usa
+    model_dump(): recorrería también structuredContent, una copia del mismo resultado
+    que después no se usa.
+    """
+    content = []
+    for item in getattr(result, "content", None) or []:
+        text = getattr(item, "text", None)
+        if text is not None:
+            content.append({"type": item.type, "text": text})
+        elif getattr(item, "data", None) is not None:
+            content.append({"type": item.type, "data": item.data, "mimeType": getattr(item, "mimeType", None)})
+        else:
+            content.append(dump(item))
+    return {"content": content, "isError": bool(getattr(result, "isError", False))}
+
 @asynccontextmanager
-async def open_session():
+async def open_session(replicas: int | None = None):
+    """
+    Abre una sesión con el servidor Soccer MCP. Con SOCCER_MCP_REPLICAS > 1 (o 'auto')
+    se levanta un pool de procesos con balanceo por peticiones en curso.
+    """
+    replicas = replicas if replicas is not None else replicas_from_env()
+    if replicas > 1:
+        async with StdioReplicaPool(server_params, replicas) as pool:
+            yield pool
+        return
+
     params = server_params()
-    async with stdio_client(params) as (read, write):
-        async with ClientSession(read, write) as session:
+    async with _stdio().stdio_client(params) as (read, write):
+        async with _client_session_cls()(read, write) as session:
             await session.initialize()
             yield session
 
@@ -107,10 +149,10 @@ class HTTPMCPClient:
                 if line.startswith('data: '):
                     json_str = line[6:]
                     try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
+                        return fast_json.loads(json_str)
+                    except ValueError:
                         continue
-            return json.loads(sse_text)
+            return fast_json.loads(sse_text)
         except Exception:
             return None
     
@@ -119,7 +161,7 @@ class HTTPMCPClient:
         if self.initialized:
             return True
             
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with _httpx().AsyncClient(timeout=30.0) as client:
             try:
                 # Paso 1: Obtener session ID
                 headers = {
@@ -200,7 +242,7 @@ class HTTPMCPClient:
         if not await self.ensure_session():
             return []
             
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with _httpx().AsyncClient(timeout=30.0) as client:
             try:
                 headers = {
                     "Content-Type": "application/json",
@@ -257,7 +299,7 @@ class HTTPMCPClient:
         if arguments is None:
             arguments = {}
             
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with _httpx().AsyncClient(timeout=30.0) as client:
             try:
                 headers = {
                     "Content-Type": "application/json",
@@ -316,9 +358,9 @@ async def open_fs_session():
     if not cmd:
         raise RuntimeError("FS_MCP_COMMAND no está configurado en .env")
 
-    params = StdioServerParameters(command=cmd, args=args, cwd=cwd)
-    async with stdio_client(params) as (read, write):
-        async with ClientSession(read, write) as session:
+    params = _stdio().StdioServerParameters(command=cmd, args=args, cwd=cwd)
+    async with _stdio().stdio_client(params) as (read, write):
+        async with _client_session_cls()(read, write) as session:
             yield session
 
 @asynccontextmanager
@@ -329,9 +371,9 @@ async def open_git_session():
     if not cmd:
         raise RuntimeError("GIT_MCP_COMMAND no está configurado en .env")
 
-    params = StdioServerParameters(command=cmd, args=args, cwd=cwd)
-    async with stdio_client(params) as (read, write):
-        async with ClientSession(read, write) as session:
+    params = _stdio().StdioServerParameters(command=cmd, args=args, cwd=cwd)
+    async with _stdio().stdio_client(params) as (read, write):
+        async with _client_session_cls()(read, write) as session:
             await session.initialize()
             yield session
 
@@ -340,7 +382,7 @@ async def list_tools(session) -> List[Dict]:
     if isinstance(session, HTTPMCPClient):
         return await session.list_tools()
     else:
-        # Sesión STDIO tradicional
+        # Sesión STDIO tradicional (o pool de réplicas, con la misma interfaz)
         listing = await session.list_tools()
         listing_dict = dump(listing)          # ← convierte ListToolsResult a dict
         return listing_dict.get("tools", [])
@@ -357,7 +399,7 @@ async def call_tool(session, name: str, args: dict) -> Tuple[dict, int]:
         # Sesión STDIO tradicional
         result = await session.call_tool(name, args)
         ms = int((time.perf_counter() - t0) * 1000)
-        return dump(result), ms               # ← convierte CallToolResult a dict
+        return tool_result_dict(result), ms   # ← convierte CallToolResult a dict
 
 async def invoke_tool(session, name: str, args: dict = None) -> Dict[str, Any]:
     """
@@ -401,9 +443,10 @@ async def invoke_tool(session, name: str, args: dict = None) -> Dict[str, Any]:
                 try:
                     # Intentar parsear como JSON si es string
                     if isinstance(extracted_data[0], str):
-                        return json.loads(extracted_data[0])
+                        return fast_json.loads(extracted_data[0])
                     return extracted_data[0]
-                except (json.JSONDecodeError, TypeError):
+                except (ValueError, TypeError):
+                    # orjson.JSONDecodeError y json.JSONDecodeError heredan de ValueError
                     return extracted_data[0]
             
             return extracted_data
@@ -0,0 +1,267 @@
+import asyncio
+import json
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from result_cache import ResultCache, cache_key, is_error_result, is_stale_result
+
+# Herramientas que solo leen datos y se pueden ejecutar de forma especulativa
+READ_ONLY_PREFIXES = ("get_", "list_", "search_", "read_")
+READ_ONLY_TOOLS = {
+    "directory_tree",
+    "get_file_info",
+    "git_status",
+    "git_log",
+    "git_show",
+    "git_diff",
+    "git_diff_staged",
+    "git_diff_unstaged",
+}
+# Prefijos de enrutamiento que no forman parte del nombre real de la herramienta
+ROUTING_PREFIXES = ("fs_", "op_")
+
+# Más de este tiempo entre llamadas se considera otra conversación
+SESSION_GAP_SECONDS = 600
+# Límite de nodos a recorrer al buscar un argumento dentro de un resultado
+MAX_RESULT_NODES = 20000
+LIST_WILDCARD = "[]"
+
+def is_read_only(tool_name: str) -> bool:
+    """Indica si una herramienta es de solo lectura y puede precargarse"""
+    if tool_name in READ_ONLY_TOOLS:
+        return True
+    base_name = tool_name
+    for prefix in ROUTING_PREFIXES:
+        if base_name.startswith(prefix):
+            base_name = base_name[len(prefix):]
+            break
+    return base_name in READ_ONLY_TOOLS or base_name.startswith(READ_ONLY_PREFIXES)
+
+def _is_tool_entry(tool_name: str) -> bool:
+    """Las entradas de control del log (USER_QUESTION, *_CONNECTION...) van en mayúsculas"""
+    return bool(tool_name) and not tool_name.isupper()
+
+def _same_value(a, b) -> bool:
+    """Compara valores escalares tolerando "1" frente a 1 (los modelos mezclan ambos)"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b
+    if isinstance(a, (str, int, float)) and isinstance(b, (str, int, float)):
+        return str(a) == str(b)
+    return False
+
+def _find_result_path(result, value) -> Optional[Tuple[str, ...]]:
+    """Busca la ruta más corta dentro del resultado donde aparece el valor (listas como [])"""
+    if isinstance(value, (dict, list)) or value is None:
+        return None
+    queue = deque([(result, ())])
+    visited = 0
+    while queue and visited < MAX_RESULT_NODES:
+        node, path = queue.popleft()
+        visited += 1
+        if isinstance(node, dict):
+            queue.extend((child, path + (key,)) for key, child in node.items())
+        elif isinstance(node, list):
+            queue.extend((child, path + (LIST_WILDCARD,)) for child in node)
+        elif path and _same_value(node, value):
+            return path
+    return None
+
+def _values_at(result, path: Tuple[str, ...]) -> List[Any]:
+    nodes = [result]
+    for step in path:
+        next_nodes = []
+        for node in nodes:
+            if step == LIST_WILDCARD and isinstance(node, list):
+                next_nodes.extend(node)
+            elif isinstance(node, dict) and step in node:
+                next_nodes.append(node[step])
+        nodes = next_nodes
+    return [n for n in nodes if isinstance(n, (str, int, float)) and not isinstance(n, bool)]
+
+def _params_template(prev_params: dict, prev_result, next_params: dict):
+    """
+    Describe cómo se obtuvieron los parámetros de la siguiente llamada a partir de la
+    anterior: ("param", clave) si repite un parámetro, o ("result", ruta) si sale del
+    resultado. Devuelve None si algún parámetro no se puede derivar; esas llamadas no
+    se precargan para no repetir valores fijos de otras sesiones.
+    """
+    template = []
+    for key, value in sorted(next_params.items()):
+        source = next((k for k, v in prev_params.items() if _same_value(v, value)), None)
+        if source is not None:
+            template.append((key, "param", source))
+            continue
+        path = _find_result_path(prev_result, value) if prev_result is not None else None
+        if path is None:
+            return None
+        template.append((key, "result", path))
+    return tuple(template)
+
+class ToolPrefetcher:
+    """
+    Aprende qué herramienta suele seguir a otra a partir del log de llamadas MCP y,
+    cuando una herramienta responde, lanza en segundo plano las continuaciones más
+    probables para que la siguiente llamada se resuelva desde la caché.
+    """
+
+    def __init__(self, log_path: str = "logs/mcp_calls.txt", max_prefetch: int = 2,
+                 min_probability: float = 0.25, min_count: int = 1, ttl_seconds: float = 300.0):
+        self.log_path = log_path
+        self.max_prefetch = max_prefetch
+        self.min_probability = min_probability
+        self.min_count = min_count
+        self.transitions: Dict[str, Counter] = defaultdict(Counter)
+        self.templates: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+        # Valores históricos de cada argumento que sale de una lista del resultado
+        self.values: Dict[Tuple[str, str, str], Counter] = defaultdict(Counter)
+        self.cache = ResultCache(ttl_seconds=ttl_seconds)
+        self.inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "prefetched": 0, "invalidations": 0}
+        self._loaded = False
+        self._last_call: Optional[Tuple[str, dict, Any]] = None
+
+    def learn_from_log(self):
+        """Carga las frecuencias de transición desde el log de llamadas"""
+        self._loaded = True
+        try:
+            with open(self.log_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+
+        previous = None
+        previous_time = None
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            tool_name = entry.get("tool", "")
+            if not _is_tool_entry(tool_name):
+                # Una nueva conexión marca el inicio de otra sesión
+                if tool_name.endswith("CONNECTION"):
+                    previous = None
+                continue
+            if is_error_result(entry.get("result")) or is_stale_result(entry.get("result")):
+                continue
+            try:
+                timestamp = datetime.strptime(entry.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                timestamp = None
+            if previous_time and timestamp and (timestamp - previous_time).total_seconds() > SESSION_GAP_SECONDS:
+                previous = None
+            params = entry.get("parameters") or {}
+            if previous is not None:
+                self._add_transition(*previous, tool_name, params)
+            previous = (tool_name, params, entry.get("result"))
+            previous_time = timestamp
+
+    def _add_transition(self, prev_tool: str, prev_params: dict, prev_result, next_tool: str, next_params: dict):
+        self.transitions[prev_tool][next_tool] += 1
+        template = _params_template(prev_params, prev_result, next_params)
+        self.templates[(prev_tool, next_tool)][template] += 1
+        for key, kind, _ in template or ():
+            if kind == "result":
+                self.values[(prev_tool, next_tool, key)][json.dumps(next_params[key])] += 1
+
+    def record(self, tool_name: str, params: Optional[dict], result=None):
+        """Registra una llamada real para seguir aprendiendo durante la sesión"""
+        if not self._loaded:
+            self.learn_from_log()
+        params = params or {}
+        if self._last_call is not None:
+            self._add_transition(*self._last_call, tool_name, params)
+        self._last_call = (tool_name, params, result)
+
+    def _resolve(self, prev_tool: str, next_tool: str, template, params: dict, result) -> Optional[dict]:
+        resolved = {}
+        for key, kind, source in template:
+            if kind == "param":
+                if source not in params:
+                    return None
+                resolved[key] = params[source]
+                continue
+            candidates = _values_at(result, source)
+            if not candidates:
+                return None
+            if len(set(map(str, candidates))) == 1:
+                resolved[key] = candidates[0]
+                continue
+            # Varios candidatos (p. ej. una lista de competiciones): se elige el más
+            # pedido históricamente, siempre que esté en el resultado actual
+            history = self.values[(prev_tool, next_tool, key)]
+            best = max(candidates, key=lambda c: history.get(json.dumps(c), 0))
+            if not history.get(json.dumps(best)):
+                return None
+            resolved[key] = best
+        return resolved
+
+    def predict(self, tool_name: str, params: Optional[dict], result=None) -> List[Tuple[str, dict, float]]:
+        """Devuelve las continuaciones más probables como (herramienta, parámetros, probabilidad)"""
+        if not self._loaded:
+            self.learn_from_log()
+        params = params or {}
+        followers = self.transitions.get(tool_name)
+        if not followers:
+            return []
+        total = sum(followers.values())
+        predictions = []
+        for next_tool, count in followers.most_common():
+            probability = count / total
+            if probability < self.min_probability:
+                break
+            if count < self.min_count or not is_read_only(next_tool):
+                continue
+            template, _ = self.templates[(tool_name, next_tool)].most_common(1)[0]
+            if template is None:
+                continue
+            next_params = self._resolve(tool_name, next_tool, template, params, result)
+            if next_params is None or (next_tool == tool_name and next_params == params):
+                continue
+            predictions.append((next_tool, next_params, probability))
+            if len(predictions) >= self.max_prefetch:
+                break
+        return predictions
+
+    async def get(self, tool_name: str, params: Optional[dict]):
+        """Devuelve (y consume) el resultado precargado si existe, si no None"""
+        task = self.inflight.get(cache_key(tool_name, params))
+        if task is not None:
+            await asyncio.wait([task])
+        result = self.cache.pop(tool_name, params)
+        self.stats["hits" if result is not None else "misses"] += 1
+        return result
+
+    def invalidate(self):
+        """Descarta todo lo precargado: una escritura puede haberlo dejado obsoleto"""
+        if self.inflight or len(self.cache):
+            self.stats["invalidations"] += 1
+        self.cancel_pending()
+        self.cache.clear()
+
+    def schedule(self, tool_name: str, params: Optional[dict], result,
+                 runner: Callable[[str, dict], Awaitable[Any]]):
+        """Lanza en segundo plano las llamadas que probablemente vendrán después"""
+        for next_tool, next_params, _ in self.predict(tool_name, params, result):
+            key = cache_key(next_tool, next_params)
+            if key in self.inflight or key in self.cache:
+                continue
+            task = asyncio.create_task(self._prefetch(next_tool, next_params, runner))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self.inflight.pop(key, None))
+
+    async def _prefetch(self, tool_name: str, params: dict, runner):
+        try:
+            result = await runner(tool_name, params)
+        except Exception:
+            return
+        if not is_error_result(result):
+            self.stats["prefetched"] += 1
+            self.cache.put(tool_name, params, result)
+
+    def cancel_pending(self):
+        """Cancela las precargas pendientes (p. ej. antes de cerrar las sesiones)"""
+        for task in list(self.inflight.values()):
+            task.cancel()
+        self.inflight.clear()
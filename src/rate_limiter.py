@@ -0,0 +1,146 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from result_cache import ResultCache, is_stale_result
+
+# Prioridades: menor número se atiende antes
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_PREFETCH = 2
+
+# Textos con los que la API de fútbol (o el servidor MCP) informa que se superó la cuota
+THROTTLING_MARKERS = ("429", "too many requests", "rate limit", "quota", "cuota")
+
+def is_throttling_error(result: Any) -> bool:
+    """Indica si un resultado de error se debe a la cuota de la API y no a otro fallo"""
+    if not (isinstance(result, dict) and "error" in result):
+        return False
+    message = str(result["error"]).lower()
+    return any(marker in message for marker in THROTTLING_MARKERS)
+
+def _env_number(var_name: str, default, cast=float):
+    """Lee un número positivo del entorno; si falta o no es válido usa el valor por defecto"""
+    value = os.getenv(var_name)
+    if value is None or not value.strip():
+        return default
+    try:
+        number = cast(value.strip())
+    except ValueError:
+        return default
+    return number if number > 0 else default
+
+class TokenBucketScheduler:
+    """
+    Token bucket con cola de prioridad para no superar la cuota de la API de fútbol.
+    Las peticiones interactivas se atienden antes que las de lotes; la precarga nunca
+    espera y solo usa tokens por encima de una reserva, para que no le quite cuota a la
+    siguiente pregunta del usuario. Se guarda el último resultado bueno de cada llamada
+    (durante stale_ttl_seconds) para usarlo cuando no hay cuota.
+    """
+
+    def __init__(self, rate_per_minute: float = 10, burst: Optional[int] = None, cache_size: int = 256,
+                 reserve: Optional[int] = None, stale_ttl_seconds: float = 900.0):
+        self.rate = rate_per_minute / 60.0  # tokens por segundo
+        self.capacity = burst if burst is not None else max(1, int(rate_per_minute))
+        # Tokens que la precarga no puede usar (por defecto una cuarta parte del burst)
+        self.reserve = reserve if reserve is not None else max(1, self.capacity // 4)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        # Pasado este tiempo un resultado (p. ej. un marcador en vivo) ya no sirve de respaldo
+        self._cache = ResultCache(max_entries=cache_size, ttl_seconds=stale_ttl_seconds)
+        self._waiters = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Task] = None
+        self.stats = {"granted": 0, "waited": 0, "cache_fallbacks": 0, "timeouts": 0, "prefetch_skipped": 0}
+
+    @classmethod
+    def from_env(cls):
+        # Se llama al importar tool_router: un valor mal escrito no debe impedir el arranque
+        return cls(
+            _env_number("SOCCER_RATE_LIMIT_PER_MINUTE", 10.0),
+            _env_number("SOCCER_RATE_BURST", None, int),
+            reserve=_env_number("SOCCER_RATE_RESERVE", None, int),
+            stale_ttl_seconds=_env_number("SOCCER_RATE_STALE_TTL_SECONDS", 900.0),
+        )
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, reserve: int = 0) -> bool:
+        """Toma un token si hay uno libre (dejando `reserve` sin tocar) y nadie está esperando"""
+        self._refill()
+        if self.tokens >= 1 + reserve and not self._waiters:
+            self.tokens -= 1
+            self.stats["granted"] += 1
+            return True
+        return False
+
+    def try_acquire_prefetch(self) -> bool:
+        """La precarga no hace cola: solo corre si sobra cuota por encima de la reserva"""
+        if self.try_acquire(self.reserve):
+            return True
+        self.stats["prefetch_skipped"] += 1
+        return False
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        """Espera un token según la prioridad; devuelve False si se agota el timeout"""
+        if self.try_acquire():
+            return True
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self.stats["waited"] += 1
+        self._ensure_wakeup()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return True  # El token llegó justo al expirar
+            future.cancel()
+            self.stats["timeouts"] += 1
+            return False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _ensure_wakeup(self):
+        if self._wakeup is None or self._wakeup.done():
+            self._wakeup = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        while self._waiters:
+            self._refill()
+            while self.tokens >= 1 and self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if future.done():
+                    continue  # Esperador cancelado por timeout
+                self.tokens -= 1
+                self.stats["granted"] += 1
+                future.set_result(True)
+            if self._waiters:
+                await asyncio.sleep(max(0.01, (1 - self.tokens) / self.rate))
+
+    def remember(self, tool_name: str, params: Optional[dict], result):
+        """Guarda el último resultado correcto para usarlo como respaldo"""
+        self._cache.put(tool_name, params, result)
+
+    def cached(self, tool_name: str, params: Optional[dict]):
+        """
+        Devuelve el último resultado guardado, marcado como antiguo para que el modelo no
+        lo presente como dato actual: {"stale": true, "cached_at": ..., "result": ...}.
+        None si no hay ninguno o ya expiró.
+        """
+        entry = self._cache.get_with_age(tool_name, params)
+        if entry is None:
+            return None
+        result, age_seconds = entry
+        self.stats["cache_fallbacks"] += 1
+        cached_at = datetime.now() - timedelta(seconds=age_seconds)
+        return {"stale": True, "cached_at": cached_at.strftime("%Y-%m-%d %H:%M:%S"), "result": result}
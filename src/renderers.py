@@ -0,0 +1,123 @@
+import os
+import unicodedata
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from startup import timed_import
+
+# Registro de plantillas: herramienta -> función(resultado, parámetros) -> texto o None
+RENDERERS: Dict[str, Callable[[Any, dict], Optional[str]]] = {}
+# Palabras que indican que la pregunta pide justo lo que muestra la plantilla
+INTENTS: Dict[str, Tuple[str, ...]] = {}
+
+# Preguntas por un dato concreto, una comparación o un filtro: la plantilla muestra
+# el resultado completo y no las responde, así que las redacta el modelo
+SPECIFIC_QUESTION_MARKERS = (
+    "cuant", "cuando", "donde", "por que", "porque", "cual", "quien", "compar", " vs", "versus",
+    "mejor", "peor", "diferencia", "solo ", "unicamente", "mas ", "menos ", "resum", "explica",
+)
+
+render_stats = {"tool_turns": 0, "direct_renders": 0, "declined": 0}
+
+def register(*tool_names: str, intents: Tuple[str, ...] = ()):
+    """
+    Decorador para registrar una plantilla de respuesta directa para una o más
+    herramientas. `intents` son las palabras (sin tildes) que debe contener la
+    pregunta para que la plantilla la responda por completo.
+    """
+    def decorator(func):
+        for tool_name in tool_names:
+            RENDERERS[tool_name] = func
+            INTENTS[tool_name] = intents
+        return func
+    return decorator
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return " ".join("".join(c for c in text if not unicodedata.combining(c)).replace("?", " ").replace("¿", " ").split()) + " "
+
+def answers_question(tool_name: str, question: str) -> bool:
+    """Indica si la plantilla de la herramienta responde la pregunta tal cual se hizo"""
+    text = " " + _normalize(question or "")
+    if any(marker in text for marker in SPECIFIC_QUESTION_MARKERS):
+        return False
+    return any(intent in text for intent in INTENTS.get(tool_name, ()))
+
+def direct_render_enabled() -> bool:
+    return os.getenv("DIRECT_RENDER", "").lower() in ("1", "true", "yes")
+
+def render(tool_name: str, result: Any, params: Optional[dict], question: str) -> Optional[str]:
+    """
+    Formatea el resultado con su plantilla; None si no hay plantilla, si el resultado
+    es un error o si la pregunta pide algo que la plantilla no responde
+    """
+    renderer = RENDERERS.get(tool_name)
+    if renderer is None or (isinstance(result, dict) and "error" in result):
+        return None
+    if not answers_question(tool_name, question):
+        render_stats["declined"] += 1
+        return None
+    try:
+        return renderer(result, params or {})
+    except (KeyError, TypeError, AttributeError, IndexError):
+        # Forma inesperada: se deja que el modelo redacte la respuesta
+        return None
+
+def _name(obj) -> str:
+    return obj.get("name", "?") if isinstance(obj, dict) else "?"
+
+@register("get_team_by_id", intents=("info", "datos", "ficha", "detalle", "perfil", "hablame", "cuentame", "dime sobre"))
+def render_team(team, params):
+    lines = [f"[bold]{team['name']}[/bold] ({team.get('tla') or team.get('shortName', '')})"]
+    if team.get("area"):
+        lines.append(f"País: {_name(team['area'])}")
+    if team.get("founded"):
+        lines.append(f"Fundado: {team['founded']}")
+    if team.get("venue"):
+        lines.append(f"Estadio: {team['venue']}")
+    if team.get("coach") and team["coach"].get("name"):
+        lines.append(f"Entrenador: {team['coach']['name']}")
+    if team.get("runningCompetitions"):
+        lines.append("Competiciones: " + ", ".join(_name(c) for c in team["runningCompetitions"]))
+    if team.get("squad"):
+        lines.append(f"Plantilla: {len(team['squad'])} jugadores")
+    return "\n".join(lines)
+
+@register("get_player_by_id", intents=("info", "datos", "ficha", "detalle", "perfil", "hablame", "cuentame", "dime sobre"))
+def render_player(player, params):
+    lines = [f"[bold]{player['name']}[/bold]"]
+    if player.get("position"):
+        lines.append(f"Posición: {player['position']}")
+    if player.get("dateOfBirth"):
+        lines.append(f"Fecha de nacimiento: {player['dateOfBirth']}")
+    if player.get("nationality"):
+        lines.append(f"Nacionalidad: {player['nationality']}")
+    if player.get("shirtNumber"):
+        lines.append(f"Dorsal: {player['shirtNumber']}")
+    if player.get("currentTeam"):
+        lines.append(f"Equipo actual: {_name(player['currentTeam'])}")
+    return "\n".join(lines)
+
+@register("get_top_scorers_by_competitions", intents=("goleador", "pichichi", "tabla de goleo", "top scorer"))
+def render_top_scorers(data, params):
+    competition = _name(data.get("competition"))
+    scorers = data["scorers"]
+    if not scorers:
+        return f"Todavía no hay goleadores registrados en {competition} esta temporada."
+    lines = [f"[bold]Goleadores de {competition}[/bold]"]
+    for position, scorer in enumerate(scorers, 1):
+        assists = f", {scorer['assists']} asistencias" if scorer.get("assists") else ""
+        lines.append(f"{position}. {_name(scorer['player'])} ({_name(scorer.get('team'))}) - {scorer.get('goals', 0)} goles{assists}")
+    return "\n".join(lines)
+
+@register("fs_list_directory", "fs_list_directory_with_sizes",
+          intents=("lista", "listar", "contenido", "archivos", "que hay", "muestra", "ls "))
+def render_directory_listing(listing, params):
+    if not isinstance(listing, str) or listing.startswith("Error"):
+        return None
+    # Se escapa para que rich no tome como marcado un nombre de archivo como "[red]x"
+    escaped = timed_import("rich.markup").escape(listing)
+    return f"[bold]Contenido de {params.get('path', '.')}[/bold]\n{escaped}"
+
+def plain(text: str) -> str:
+    """Quita el marcado de rich para guardar la respuesta en el historial"""
+    return text.replace("[bold]", "").replace("[/bold]", "").replace("\\[", "[")
@@ -0,0 +1,196 @@
+import asyncio
+import os
+from typing import Any, Callable, List, Optional, Set
+
+from startup import timed_import
+
+def replicas_from_env(var_name: str = "SOCCER_MCP_REPLICAS") -> int:
+    """Lee la cantidad de réplicas; 'auto' usa un proceso por núcleo (máximo 8)"""
+    value = (os.getenv(var_name) or "1").strip().lower()
+    if value == "auto":
+        return max(1, min(8, os.cpu_count() or 1))
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return 1
+
+# Errores que indican que el proceso o su canal stdio ya no sirven
+TRANSPORT_ERROR_NAMES = {"ClosedResourceError", "BrokenResourceError", "EndOfStream"}
+# Código JSON-RPC que usa el SDK de MCP cuando se cierra la conexión
+CONNECTION_CLOSED_CODE = -32000
+
+def is_transport_error(error: BaseException) -> bool:
+    """Indica si un error de llamada se debe a que la réplica murió o no responde"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, EOFError)):
+        return True
+    if type(error).__name__ in TRANSPORT_ERROR_NAMES:
+        return True
+    return getattr(getattr(error, "error", None), "code", None) == CONNECTION_CLOSED_CODE
+
+class Replica:
+    """Un proceso del servidor MCP con su propia sesión stdio"""
+
+    def __init__(self, index: int, params):
+        self.index = index
+        self.params = params
+        self.session = None
+        self.outstanding = 0
+        self.calls = 0
+        self.healthy = False
+        self.restarts = 0
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    async def start(self, timeout: float = 30.0):
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._ready.wait(), timeout)
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self):
+        # stdio_client usa task groups de anyio: hay que entrar y salir en la misma tarea
+        stdio = timed_import("mcp.client.stdio")
+        client_session_cls = timed_import("mcp.client.session").ClientSession
+        try:
+            async with stdio.stdio_client(self.params) as (read, write):
+                async with client_session_cls(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self.healthy = True
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.healthy = False
+            self.session = None
+            self._ready.set()
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done() and self.healthy
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, 5.0)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+
+class StdioReplicaPool:
+    """
+    Pool de N procesos de un mismo servidor MCP stdio. Cada llamada va a la réplica
+    sana con menos peticiones en curso; un chequeo periódico hace ping y reinicia las
+    réplicas caídas. Expone call_tool/list_tools como un ClientSession.
+    """
+
+    def __init__(self, params_factory: Callable[[], Any], size: int, health_interval: float = 15.0,
+                 call_timeout: float = 60.0):
+        self.params_factory = params_factory
+        self.size = size
+        self.health_interval = health_interval
+        self.call_timeout = call_timeout
+        self.replicas: List[Replica] = []
+        self.peak_outstanding = 0
+        self._health_task: Optional[asyncio.Task] = None
+        self._restart_locks: dict = {}
+        # Reinicios lanzados en segundo plano; se cancelan al cerrar el pool
+        self._restart_tasks: Set[asyncio.Task] = set()
+        self._closed = False
+
+    async def __aenter__(self):
+        params = self.params_factory()
+        self.replicas = [Replica(i, params) for i in range(self.size)]
+        results = await asyncio.gather(*(r.start() for r in self.replicas), return_exceptions=True)
+        if not any(r.alive for r in self.replicas):
+            await self.close()
+            errors = [e for e in results if isinstance(e, BaseException)]
+            raise RuntimeError(f"No se pudo iniciar ninguna réplica del servidor MCP: {errors[0] if errors else 'desconocido'}")
+        self._health_task = asyncio.create_task(self._health_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for task in list(self._restart_tasks):
+            task.cancel()
+        await asyncio.gather(*list(self._restart_tasks), return_exceptions=True)
+        await asyncio.gather(*(r.stop() for r in self.replicas), return_exceptions=True)
+
+    def _pick(self) -> Replica:
+        candidates = [r for r in self.replicas if r.alive]
+        if not candidates:
+            raise RuntimeError("No hay réplicas disponibles del servidor MCP")
+        return min(candidates, key=lambda r: r.outstanding)
+
+    def _schedule_restart(self, replica: Replica):
+        """Reinicia la réplica en segundo plano sin bloquear la llamada que detectó el fallo"""
+        if self._closed:
+            return
+        task = asyncio.create_task(self._restart(replica))
+        self._restart_tasks.add(task)
+        task.add_done_callback(self._restart_tasks.discard)
+
+    async def _restart(self, replica: Replica):
+        lock = self._restart_locks.setdefault(replica.index, asyncio.Lock())
+        async with lock:
+            if replica.alive or self._closed:
+                return
+            await replica.stop()
+            replica.restarts += 1
+            try:
+                await replica.start()
+            except Exception:
+                pass  # Se reintentará en el próximo chequeo de salud
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for replica in self.replicas:
+                if replica.alive:
+                    try:
+                        await asyncio.wait_for(replica.session.send_ping(), 5.0)
+                        continue
+                    except Exception:
+                        replica.healthy = False
+                await self._restart(replica)
+
+    async def _call(self, method: str, *args):
+        replica = self._pick()
+        replica.outstanding += 1
+        replica.calls += 1
+        self.peak_outstanding = max(self.peak_outstanding, sum(r.outstanding for r in self.replicas))
+        try:
+            return await asyncio.wait_for(getattr(replica.session, method)(*args), self.call_timeout)
+        except Exception as e:
+            # Un proceso caído deja su tarea esperando en _run, así que alive no basta:
+            # ante un canal cerrado o un timeout se marca como no sana y se reinicia
+            if is_transport_error(e) or not replica.alive:
+                replica.healthy = False
+                self._schedule_restart(replica)
+            raise
+        finally:
+            replica.outstanding -= 1
+
+    async def call_tool(self, name: str, arguments: dict = None):
+        return await self._call("call_tool", name, arguments or {})
+
+    async def list_tools(self):
+        return await self._call("list_tools")
+
+    def stats(self) -> List[dict]:
+        return [
+            {"replica": r.index, "alive": r.alive, "calls": r.calls, "outstanding": r.outstanding, "restarts": r.restarts}
+            for r in self.replicas
+        ]
@@ -0,0 +1,72 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+def cache_key(tool_name: str, params: Optional[dict]) -> Tuple[str, str]:
+    """Clave estable para una llamada: nombre de la herramienta + parámetros ordenados"""
+    return tool_name, json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+
+def is_error_result(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+def is_stale_result(result: Any) -> bool:
+    """Resultado guardado que se devolvió en lugar de una llamada real (sin cuota)"""
+    return isinstance(result, dict) and result.get("stale") is True and "result" in result
+
+class ResultCache:
+    """
+    Caché LRU de resultados de herramientas, con expiración opcional. La usan la
+    precarga (entradas de un solo uso) y el limitador de cuota (último resultado bueno).
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return self._lookup(key) is not None
+
+    def put(self, tool_name: str, params: Optional[dict], result: Any):
+        """Guarda un resultado; los errores no se guardan"""
+        if is_error_result(result):
+            return
+        key = cache_key(tool_name, params)
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl_seconds is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, tool_name: str, params: Optional[dict]):
+        entry = self._lookup(cache_key(tool_name, params))
+        return entry[1] if entry is not None else None
+
+    def get_with_age(self, tool_name: str, params: Optional[dict]) -> Optional[Tuple[Any, float]]:
+        """Devuelve (resultado, segundos desde que se guardó) o None"""
+        entry = self._lookup(cache_key(tool_name, params))
+        return (entry[1], time.monotonic() - entry[0]) if entry is not None else None
+
+    def pop(self, tool_name: str, params: Optional[dict]):
+        """Devuelve y elimina la entrada (para resultados que se usan una sola vez)"""
+        key = cache_key(tool_name, params)
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        del self._entries[key]
+        return entry[1]
+
+    def clear(self):
+        self._entries.clear()
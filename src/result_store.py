@@ -0,0 +1,208 @@
+import mmap
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import fast_json
+
+RESULT_TOOL_NAME = "read_stored_result"
+
+# Definición de la herramienta sintética que se expone al modelo
+RESULT_TOOL = {
+    "type": "function",
+    "function": {
+        "name": RESULT_TOOL_NAME,
+        "description": (
+            "Lee por páginas un resultado grande guardado por una herramienta anterior. "
+            "Usa el handle que aparece en el resumen. Permite paginar (offset/limit), "
+            "filtrar por texto y quedarse solo con algunos campos. Con 'field' devuelve "
+            "completo uno de los campos de 'metadata' del resumen (allí solo aparece recortado)."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Handle del resultado, p. ej. res_1"},
+                "offset": {"type": "integer", "description": "Índice del primer elemento (por defecto 0)"},
+                "limit": {"type": "integer", "description": "Cantidad máxima de elementos (por defecto 20)"},
+                "filter": {"type": "string", "description": "Texto que debe aparecer en el elemento (sin distinguir mayúsculas)"},
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Campos a conservar de cada elemento (solo si son objetos)"
+                },
+                "field": {"type": "string", "description": "Campo de metadata a devolver completo, p. ej. competition"}
+            },
+            "required": ["handle"]
+        }
+    }
+}
+
+def _split_items(result):
+    """Separa un resultado en (elementos paginables, metadatos, ruta de la lista)"""
+    if isinstance(result, list):
+        return result, {}, None
+    if isinstance(result, dict):
+        list_keys = [k for k, v in result.items() if isinstance(v, list)]
+        if list_keys:
+            key = max(list_keys, key=lambda k: len(result[k]))
+            meta = {k: v for k, v in result.items() if k != key}
+            return result[key], meta, key
+        return [result], {}, None
+    if isinstance(result, str):
+        return result.splitlines(), {}, None
+    return [result], {}, None
+
+def _preview(value, max_chars: int = 300) -> str:
+    text = fast_json.dumps(value)
+    return text if len(text) <= max_chars else text[:max_chars] + "…"
+
+class StoredResult:
+    """Resultado volcado a disco como JSON por líneas y leído con mmap"""
+
+    def __init__(self, handle: str, path: str, offsets: List[int], meta: dict, items_key: Optional[str]):
+        self.handle = handle
+        self.path = path
+        self.offsets = offsets
+        self.meta = meta
+        self.items_key = items_key
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if offsets else None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def raw_item(self, index: int) -> bytes:
+        start = self.offsets[index]
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self._map)
+        return self._map[start:end].rstrip(b"\n")
+
+    def item(self, index: int):
+        return fast_json.loads(self.raw_item(index))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+class ResultStore:
+    """
+    Guarda fuera de la conversación los resultados de herramientas que superan un
+    umbral de tamaño. En su lugar el modelo recibe un handle y un resumen, y puede
+    consultar el contenido con la herramienta read_stored_result.
+    """
+
+    def __init__(self, threshold_bytes: int = 16000, directory: Optional[str] = None, page_size: int = 20):
+        self.threshold_bytes = threshold_bytes
+        self.page_size = page_size
+        self.directory = directory or tempfile.mkdtemp(prefix="mcp_results_")
+        self.results: Dict[str, StoredResult] = {}
+        self._counter = 0
+
+    def maybe_spill(self, tool_name: str, result: Any, encoded: Optional[str] = None) -> Any:
+        """
+        Devuelve el resultado tal cual si es pequeño, o un handle con resumen si es grande.
+        `encoded` es el resultado ya codificado, para no volver a codificarlo al medirlo.
+        """
+        if encoded is None:
+            encoded = fast_json.dumps(result)
+        size_bytes = len(encoded.encode("utf-8"))
+        if size_bytes <= self.threshold_bytes:
+            return result
+        return self.spill(tool_name, result, size_bytes=size_bytes)
+
+    def spill(self, tool_name: str, result: Any, size_bytes: Optional[int] = None) -> Dict[str, Any]:
+        items, meta, items_key = _split_items(result)
+        self._counter += 1
+        handle = f"res_{self._counter}"
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{handle}.jsonl")
+
+        offsets = []
+        position = 0
+        with open(path, "wb") as f:
+            for item in items:
+                line = fast_json.dumps(item).encode("utf-8") + b"\n"
+                offsets.append(position)
+                f.write(line)
+                position += len(line)
+
+        stored = StoredResult(handle, path, offsets, meta, items_key)
+        self.results[handle] = stored
+
+        first = items[0] if items else None
+        return {
+            "stored_result": handle,
+            "tool": tool_name,
+            "size_bytes": size_bytes if size_bytes is not None else position,
+            "total_items": len(items),
+            "items_key": items_key,
+            "metadata": {k: _preview(v, 120) for k, v in meta.items()},
+            "item_fields": list(first.keys()) if isinstance(first, dict) else None,
+            "preview": [_preview(x) for x in items[:2]],
+            "note": (
+                f"Resultado demasiado grande. Usa {RESULT_TOOL_NAME} con handle='{handle}' para paginar, filtrar "
+                f"o seleccionar campos, o con field=<clave de metadata> para leer un metadato completo."
+            )
+        }
+
+    def read(self, handle: str, offset: int = 0, limit: Optional[int] = None,
+             filter: Optional[str] = None, fields: Optional[List[str]] = None,
+             field: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Lee una página de un resultado guardado sin cargarlo completo en memoria, o con
+        `field` el valor completo de un metadato (los campos fuera de la lista paginada)
+        """
+        stored = self.results.get(handle)
+        if stored is None:
+            return {"error": f"No existe un resultado guardado con handle '{handle}'"}
+        if field is not None:
+            if field not in stored.meta:
+                return {"error": f"El resultado '{handle}' no tiene el metadato '{field}'. "
+                                 f"Disponibles: {', '.join(stored.meta) or 'ninguno'}"}
+            return {"handle": handle, "field": field, "value": stored.meta[field]}
+        try:
+            limit = max(1, min(int(limit) if limit else self.page_size, 200))
+            offset = max(0, int(offset or 0))
+        except (TypeError, ValueError):
+            return {"error": f"offset y limit deben ser enteros, se recibió offset={offset!r}, limit={limit!r}"}
+        if isinstance(fields, str):
+            fields = [fields]
+        needle = str(filter).lower() if filter else None
+
+        items = []
+        matched = 0
+        next_offset = None
+        for index in range(len(stored)):
+            if needle is not None:
+                if needle not in stored.raw_item(index).decode("utf-8").lower():
+                    continue
+            elif index < offset:
+                continue
+            if needle is not None and matched < offset:
+                matched += 1
+                continue
+            if len(items) >= limit:
+                next_offset = (matched if needle is not None else index)
+                break
+            matched += 1
+            item = stored.item(index)
+            if fields and isinstance(item, dict):
+                item = {k: item[k] for k in fields if k in item}
+            items.append(item)
+
+        return {
+            "handle": handle,
+            "offset": offset,
+            "returned": len(items),
+            "total_items": len(stored),
+            "next_offset": next_offset,
+            "items": items
+        }
+
+    def close(self):
+        """Libera los mapas de memoria y borra los archivos temporales"""
+        for stored in self.results.values():
+            stored.close()
+        self.results.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,57 @@
+import importlib
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# Referencia de tiempo para el reporte de arranque (app.py importa este módulo primero)
+STARTUP_T0 = time.perf_counter()
+
+import_times: Dict[str, float] = {}
+milestones: Dict[str, float] = {}
+
+def timed_import(module_name: str):
+    """Importa un módulo bajo demanda y registra cuánto tardó la primera importación"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    t0 = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_times[module_name] = (time.perf_counter() - t0) * 1000
+    return module
+
+def mark(name: str):
+    """Registra un hito del arranque (solo la primera vez que ocurre)"""
+    milestones.setdefault(name, (time.perf_counter() - STARTUP_T0) * 1000)
+
+class LazyObject:
+    """Proxy que construye el objeto real la primera vez que se usa uno de sus atributos"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+
+    def _get(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            instance = object.__getattribute__(self, "_factory")()
+            object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+def startup_report() -> List[str]:
+    """Genera las líneas del reporte: tiempo por importación diferida y por hito"""
+    lines = ["Reporte de arranque (cada importación incluye las que hace por dentro):"]
+    for module_name, ms in sorted(import_times.items(), key=lambda item: -item[1]):
+        lines.append(f"  import {module_name}: {ms:.1f} ms")
+    for name, ms in sorted(milestones.items(), key=lambda item: item[1]):
+        lines.append(f"  {name}: {ms:.1f} ms desde el inicio")
+    return lines
+
+def report_enabled() -> bool:
+    return os.getenv("STARTUP_REPORT", "").lower() in ("1", "true", "yes")
@@ -1,22 +1,38 @@
-from openai import OpenAI
-from dotenv import load_dotenv
 import os
 import asyncio
 import json
 import time
 from datetime import datetime
-from rich.console import Console
-from rich.panel import Panel
+from startup import LazyObject, timed_import, mark, startup_report, report_enabled
+load_dotenv = timed_import("dotenv").load_dotenv
 from mcp_client import open_session, open_op_session, open_fs_session, open_git_session, list_tools, invoke_tool
+from prefetch import ToolPrefetcher, is_read_only
+from result_store import ResultStore, RESULT_TOOL, RESULT_TOOL_NAME
+from rate_limiter import TokenBucketScheduler, PRIORITY_INTERACTIVE, PRIORITY_PREFETCH, is_throttling_error
+from result_cache import is_stale_result
+from arg_validation import ToolValidators
+from renderers import render, render_stats, direct_render_enabled, plain
+import fast_json
 
 # Configuración
 load_dotenv()
-client = OpenAI()
-console = Console()
+# openai y rich se importan y construyen la primera vez que se usan. rich y el SDK de MCP
+# se necesitan igualmente antes del primer prompt; lo que se gana es no cargar openai
+# hasta la primera pregunta y no pagar nada de esto al solo importar el módulo
+client = LazyObject(lambda: timed_import("openai").OpenAI())
+console = LazyObject(lambda: timed_import("rich.console").Console())
+prefetcher = ToolPrefetcher()
+# Cuota de la API de fútbol (football-data) compartida por todas las llamadas soccer
+soccer_limiter = TokenBucketScheduler.from_env()
+# Validadores de argumentos compilados desde el inputSchema de cada herramienta
+tool_validators = ToolValidators()
+# Máximo de rondas en las que el modelo puede paginar resultados guardados antes de responder
+MAX_PAGING_ROUNDS = 3
+mark("módulos cargados")
 
 # Sistema de logging
-def log_mcp_call(tool_name, parameters, result, execution_time_ms=None):
-    """Registra llamadas al MCP en un archivo de log"""
+def log_mcp_call(tool_name, parameters, result, execution_time_ms=None, result_json=None):
+    """Registra llamadas al MCP en un archivo de log; result_json es el resultado ya codificado"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     # Crear directorio logs si no existe
@@ -29,10 +45,11 @@ def log_mcp_call(tool_name, parameters, result, execution_time_ms=None):
         "result": result,
         "execution_time_ms": execution_time_ms
     }
+    log_line = fast_json.dumps_with_fragments(log_entry, {"result": result_json} if result_json is not None else {})
     
     try:
         with open("logs/mcp_calls.txt", "a", encoding="utf-8") as f:
-            f.write(f"{json.dumps(log_entry, ensure_ascii=False)}\n")
+            f.write(f"{log_line}\n")
     except Exception as e:
         console.print(f"[dim red]Error guardando log: {e}[/dim red]")
 
@@ -79,11 +96,13 @@ async def get_all_mcp_tools_as_openai_tools():
             
             openai_tools.append(tool_dict)
             tools_by_server[server_key].append(tool_dict)
+            tool_validators.add(final_name, tool_input_schema)
     
     # ==================== SOCCER MCP SERVER ====================
     try:
         console.print("[yellow]🔄 Conectando al servidor Soccer MCP...[/yellow]")
-        async with open_session() as session:
+        # Para listar herramientas basta con un solo proceso
+        async with open_session(replicas=1) as session:
             soccer_tools = await list_tools(session)
             console.print(f"[green]✓ Soccer MCP conectado: {len(soccer_tools)} herramientas[/green]")
             server_availability["soccer"] = True
@@ -168,59 +187,131 @@ async def get_all_mcp_tools_as_openai_tools():
     # Retornar tanto las herramientas como la disponibilidad individual para compatibilidad
     return openai_tools, server_availability["soccer"], server_availability["filesystem"], server_availability["git"], server_availability["op"], tools_by_server
 
+def resolve_tool_session(soccer_session, fs_session, git_session, op_session, tool_name):
+    """Determina la sesión, el nombre real y el servidor de una herramienta según su prefijo"""
+    if tool_name.startswith("fs_"):
+        # Herramienta de filesystem - usar fs_session
+        if fs_session is None:
+            raise RuntimeError("Filesystem MCP no está disponible")
+        return fs_session, tool_name[3:], "filesystem"  # Remover prefijo 'fs_'
+    elif tool_name.startswith("git_") or tool_name in ["git_status", "git_diff_unstaged", "git_diff_staged", "git_diff", "git_commit", "git_add", "git_reset", "git_log", "git_create_branch", "git_checkout", "git_show", "git_init", "git_branch"]:
+        # Herramienta de git - usar git_session
+        if git_session is None:
+            raise RuntimeError("Git MCP no está disponible")
+        # No remover prefijo para estas herramientas ya que todas empiezan con git_
+        return git_session, tool_name, "git"
+    elif tool_name.startswith("op_"):
+        # Herramienta de One Piece - usar op_session
+        if op_session is None:
+            raise RuntimeError("One Piece MCP no está disponible")
+        # No remover prefijo para las herramientas de One Piece
+        return op_session, tool_name, "One Piece"
+    else:
+        # Herramienta de soccer - usar soccer_session
+        if soccer_session is None:
+            raise RuntimeError("Soccer MCP no está disponible")
+        return soccer_session, tool_name, "soccer"
+
+async def dispatch_tool(session, actual_tool_name, server_label, tool_name, params=None, priority=PRIORITY_INTERACTIVE):
+    """Invoca la herramienta; las de fútbol pasan por el limitador de cuota de la API"""
+    if server_label != "soccer":
+        return await invoke_tool(session, actual_tool_name, params or {})
+
+    if priority == PRIORITY_PREFETCH:
+        # La precarga no hace cola: si la esperara, una pregunta que necesita justo ese
+        # resultado quedaría detrás de ella con prioridad de precarga
+        if not soccer_limiter.try_acquire_prefetch():
+            return {"error": "Precarga omitida para reservar cuota a las preguntas del usuario"}
+    elif not soccer_limiter.try_acquire():
+        # Sin cuota: en turnos interactivos se prefiere el último resultado guardado
+        if priority == PRIORITY_INTERACTIVE:
+            stale = soccer_limiter.cached(tool_name, params)
+            if stale is not None:
+                console.print("[dim yellow]  Cuota de la API agotada, usando el último resultado guardado[/dim yellow]")
+                return stale
+        timeout = None if priority == PRIORITY_INTERACTIVE else 10.0
+        if not await soccer_limiter.acquire(priority, timeout=timeout):
+            return {"error": "Cuota de la API de fútbol agotada, intenta de nuevo en unos segundos"}
+
+    result = await invoke_tool(session, actual_tool_name, params or {})
+    if isinstance(result, dict) and "error" in result:
+        # Solo se sustituye un error de cuota; cualquier otro error (id inválido, réplica
+        # caída...) se devuelve tal cual para que el modelo lo vea
+        if priority == PRIORITY_INTERACTIVE and is_throttling_error(result):
+            stale = soccer_limiter.cached(tool_name, params)
+            if stale is not None:
+                console.print("[dim yellow]  La API rechazó la llamada por cuota, usando el último resultado guardado[/dim yellow]")
+                return stale
+    else:
+        soccer_limiter.remember(tool_name, params, result)
+    return result
+
 async def execute_mcp_tool(soccer_session, fs_session, git_session, op_session, tool_name, params=None):
-    """Ejecuta una herramienta específica en el servidor MCP correspondiente"""
+    """
+    Ejecuta una herramienta específica en el servidor MCP correspondiente.
+    Devuelve (resultado, resultado codificado en JSON); el texto se reutiliza en el log,
+    al medir el tamaño y en el mensaje para el modelo.
+    """
     start_time = datetime.now()
     try:
         console.print(f"[yellow]→ Ejecutando herramienta: {tool_name}[/yellow]")
         if params:
             console.print(f"[dim yellow]  Parámetros: {params}[/dim yellow]")
 
-        import time
         t0 = time.perf_counter()
         
-        # Determinar qué servidor usar basado en el prefijo de la herramienta
-        if tool_name.startswith("fs_"):
-            # Herramienta de filesystem - usar fs_session
-            if fs_session is None:
-                raise RuntimeError("Filesystem MCP no está disponible")
-            actual_tool_name = tool_name[3:]  # Remover prefijo 'fs_'
-            result = await invoke_tool(fs_session, actual_tool_name, params or {})
-            console.print(f"[green]✓ Herramienta filesystem ejecutada exitosamente[/green]")
-        elif tool_name.startswith("git_") or tool_name in ["git_status", "git_diff_unstaged", "git_diff_staged", "git_diff", "git_commit", "git_add", "git_reset", "git_log", "git_create_branch", "git_checkout", "git_show", "git_init", "git_branch"]:
-            # Herramienta de git - usar git_session
-            if git_session is None:
-                raise RuntimeError("Git MCP no está disponible")
-            # No remover prefijo para estas herramientas ya que todas empiezan con git_
-            result = await invoke_tool(git_session, tool_name, params or {})
-            console.print(f"[green]✓ Herramienta git ejecutada exitosamente[/green]")
-        elif tool_name.startswith("op_"):
-            # Herramienta de One Piece - usar op_session
-            if op_session is None:
-                raise RuntimeError("One Piece MCP no está disponible")
-            # No remover prefijo para las herramientas de One Piece
-            result = await invoke_tool(op_session, tool_name, params or {})
-            console.print(f"[green]✓ Herramienta One Piece ejecutada exitosamente[/green]")
+        session, actual_tool_name, server_label = resolve_tool_session(soccer_session, fs_session, git_session, op_session, tool_name)
+
+        read_only = is_read_only(tool_name)
+        if not read_only:
+            # Una escritura deja obsoleto lo precargado (p. ej. git_status antes de git_commit)
+            prefetcher.invalidate()
+
+        # Revisar si la llamada ya fue precargada en segundo plano
+        result = await prefetcher.get(tool_name, params) if read_only else None
+        if result is not None:
+            console.print(f"[green]✓ Herramienta {server_label} resuelta desde precarga[/green]")
         else:
-            # Herramienta de soccer - usar soccer_session
-            if soccer_session is None:
-                raise RuntimeError("Soccer MCP no está disponible")
-            result = await invoke_tool(soccer_session, tool_name, params or {})
-            console.print(f"[green]✓ Herramienta soccer ejecutada exitosamente[/green]")
+            result = await dispatch_tool(session, actual_tool_name, server_label, tool_name, params)
+            if is_stale_result(result):
+                console.print(f"[yellow]✓ Herramienta {server_label} resuelta con un resultado guardado del {result['cached_at']}[/yellow]")
+            elif isinstance(result, dict) and "error" in result:
+                console.print(f"[red]✗ Herramienta {server_label} devolvió un error: {result['error']}[/red]")
+            else:
+                console.print(f"[green]✓ Herramienta {server_label} ejecutada exitosamente[/green]")
+            if not read_only:
+                # Precargas lanzadas en paralelo mientras se escribía tampoco sirven
+                prefetcher.invalidate()
         
         execution_time_ms = int((time.perf_counter() - t0) * 1000)
-        log_mcp_call(tool_name, params or {}, result, execution_time_ms)
-        return result
+        result_json = fast_json.dumps(result)
+        log_mcp_call(tool_name, params or {}, result, execution_time_ms, result_json)
+
+        # Aprender de la llamada y precargar las siguientes más probables
+        async def run_prefetch(next_tool, next_params):
+            next_session, next_actual_name, next_label = resolve_tool_session(soccer_session, fs_session, git_session, op_session, next_tool)
+            return await dispatch_tool(next_session, next_actual_name, next_label, next_tool, next_params, PRIORITY_PREFETCH)
+
+        # Un resultado guardado no es una llamada real: no se aprende de él
+        if not is_stale_result(result):
+            prefetcher.record(tool_name, params, result)
+            if not (isinstance(result, dict) and "error" in result):
+                prefetcher.schedule(tool_name, params, result, run_prefetch)
+        return result, result_json
         
     except Exception as e:
+        if not is_read_only(tool_name):
+            prefetcher.invalidate()
         execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         error_result = {"error": str(e)}
         console.print(f"[red]Error ejecutando herramienta {tool_name}: {str(e)}[/red]")
-        log_mcp_call(tool_name, params or {}, error_result, execution_time_ms)
-        return error_result
+        error_json = fast_json.dumps(error_result)
+        log_mcp_call(tool_name, params or {}, error_result, execution_time_ms, error_json)
+        return error_result, error_json
 
 async def chat_with_mcp():
     """Función principal para interactuar con el usuario y los servidores MCP"""
+    Panel = timed_import("rich.panel").Panel
     console.print(Panel.fit("⚽📁 [bold blue]Chatbot MCP - Fútbol, Archivos, Git & One Piece[/bold blue]", 
                          subtitle="Pregunta sobre fútbol o realiza operaciones con archivos • Escribe 'salir' para terminar"))
     
@@ -333,6 +424,17 @@ async def chat_with_mcp():
         console.print("[bold red]No hay servidores MCP disponibles[/bold red]")
         return
 
+def read_stored_result(result_store, args):
+    """Atiende una llamada a la herramienta sintética read_stored_result"""
+    return result_store.read(
+        args.get("handle", ""),
+        offset=args.get("offset", 0),
+        limit=args.get("limit"),
+        filter=args.get("filter"),
+        fields=args.get("fields"),
+        field=args.get("field")
+    )
+
 async def run_chat_loop(soccer_session, fs_session, git_session, op_session, capabilities, mcp_tools):
     """Ejecuta el bucle principal del chat con las sesiones proporcionadas"""
     system_message = {
@@ -348,70 +450,190 @@ Responde de manera clara y útil, organizando la información de forma legible."
 
     # Lista de mensajes de la conversación
     messages = [system_message]
+    # Los resultados grandes se guardan fuera de la conversación y se consultan por páginas
+    result_store = ResultStore()
+    mcp_tools = mcp_tools + [RESULT_TOOL]
+    tool_validators.add(RESULT_TOOL_NAME, RESULT_TOOL["function"]["parameters"])
+    first_prompt = True
 
-    while True:
-        # Solicitar entrada del usuario
+    async def run_tool_call(tool_call, allowed_names=None):
+        """
+        Valida y ejecuta una llamada a herramienta pedida por el modelo. Devuelve
+        (nombre, argumentos, resultado completo o None, mensaje para el modelo, rechazada).
+        """
+        function_name = tool_call.function.name
         try:
-            user_input = console.input("\n[bold cyan]Tu pregunta:[/bold cyan] ")
-        except KeyboardInterrupt:
-            console.print("\n[yellow]Saliendo...[/yellow]")
-            break
-        except EOFError:
-            console.print("\n[yellow]Saliendo...[/yellow]")
-            break
+            function_args = json.loads(tool_call.function.arguments or "{}")
+            function_args, validation_error = tool_validators.validate(function_name, function_args)
+        except json.JSONDecodeError as e:
+            function_args, validation_error = {}, f"Los argumentos no son JSON válido: {e}"
+        if allowed_names is not None and function_name not in allowed_names:
+            validation_error = f"La herramienta no está disponible en este paso (disponibles: {', '.join(sorted(allowed_names))})"
 
-        if user_input.lower() in ['salir', 'exit', 'quit']:
-            console.print("[yellow]¡Hasta luego![/yellow]")
-            break
+        raw_result = None
+        content = None
+        if validation_error:
+            # Argumentos inválidos: se devuelven al modelo sin llamar al servidor
+            console.print(f"[red]✗ Argumentos inválidos para {function_name}: {validation_error}[/red]")
+            tool_result = {"error": f"Argumentos inválidos para {function_name}: {validation_error}"}
+        elif function_name == RESULT_TOOL_NAME:
+            # Herramienta sintética: se resuelve localmente sobre el almacén de resultados
+            tool_result = read_stored_result(result_store, function_args)
+        else:
+            # Ejecutar la herramienta MCP correspondiente
+            raw_result, result_json = await execute_mcp_tool(soccer_session, fs_session, git_session, op_session, function_name, function_args)
+            tool_result = result_store.maybe_spill(function_name, raw_result, result_json)
+            if tool_result is raw_result:
+                content = result_json
+
+        tool_message = {
+            "tool_call_id": tool_call.id,
+            "role": "tool",
+            "name": function_name,
+            "content": content if content is not None else fast_json.dumps(tool_result)
+        }
+        return function_name, function_args, raw_result, tool_message, bool(validation_error)
 
-        # Agregar mensaje del usuario
-        messages.append({"role": "user", "content": user_input})
+    async def run_tool_calls(tool_calls, allowed_names=None):
+        """
+        Ejecuta las llamadas de un turno. Las de solo lectura consecutivas van en paralelo
+        (el pool de réplicas las reparte); las escrituras se ejecutan solas y en orden,
+        porque suelen depender de las anteriores (crear carpeta y luego escribir archivo).
+        """
+        outcomes = []
+        batch = []
+        for tool_call in tool_calls:
+            if is_read_only(tool_call.function.name) or tool_call.function.name == RESULT_TOOL_NAME:
+                batch.append(tool_call)
+                continue
+            outcomes.extend(await asyncio.gather(*(run_tool_call(tc, allowed_names) for tc in batch)))
+            batch = []
+            outcomes.append(await run_tool_call(tool_call, allowed_names))
+        outcomes.extend(await asyncio.gather(*(run_tool_call(tc, allowed_names) for tc in batch)))
+        return outcomes
 
-        try:
-            # Llamar a OpenAI
-            console.print("[dim yellow]🤖 Procesando...[/dim yellow]")
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                tools=mcp_tools,
-                tool_choice="auto"
-            )
-
-            assistant_message = response.choices[0].message
-            messages.append(assistant_message)
-
-            # Procesar llamadas a herramientas
-            if assistant_message.tool_calls:
-                for tool_call in assistant_message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-
-                    # Ejecutar la herramienta MCP correspondiente
-                    tool_result = await execute_mcp_tool(soccer_session, fs_session, git_session, op_session, function_name, function_args)
-
-                    # Agregar resultado de la herramienta a los mensajes
-                    tool_message = {
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(tool_result, ensure_ascii=False, indent=2)
-                    }
-                    messages.append(tool_message)
-
-                # Obtener respuesta final de OpenAI después de usar las herramientas
-                final_response = client.chat.completions.create(
+    # El cierre va en finally: un KeyboardInterrupt durante la llamada síncrona a OpenAI
+    # no es una Exception y saldría del bucle dejando mapas abiertos y archivos temporales
+    try:
+        while True:
+            # Solicitar entrada del usuario
+            if first_prompt:
+                first_prompt = False
+                mark("primer prompt")
+                if report_enabled():
+                    for line in startup_report():
+                        console.print(f"[dim]{line}[/dim]")
+            try:
+                user_input = console.input("\n[bold cyan]Tu pregunta:[/bold cyan] ")
+            except KeyboardInterrupt:
+                console.print("\n[yellow]Saliendo...[/yellow]")
+                break
+            except EOFError:
+                console.print("\n[yellow]Saliendo...[/yellow]")
+                break
+
+            if user_input.lower() in ['salir', 'exit', 'quit']:
+                console.print("[yellow]¡Hasta luego![/yellow]")
+                break
+
+            # Agregar mensaje del usuario; si el turno falla se descarta completo para que el
+            # historial no quede con llamadas a herramientas sin respuesta
+            turn_start = len(messages)
+            messages.append({"role": "user", "content": user_input})
+
+            try:
+                # Llamar a OpenAI
+                console.print("[dim yellow]🤖 Procesando...[/dim yellow]")
+                response = client.chat.completions.create(
                     model="gpt-4o-mini",
-                    messages=messages
+                    messages=messages,
+                    tools=mcp_tools,
+                    tool_choice="auto"
                 )
+
+                assistant_message = response.choices[0].message
+                messages.append(assistant_message)
+
+                # Procesar llamadas a herramientas
+                if assistant_message.tool_calls:
+                    render_stats["tool_turns"] += 1
+                    # Con una sola herramienta renderizable se puede responder sin otra llamada al modelo
+                    can_render = direct_render_enabled() and len(assistant_message.tool_calls) == 1
+                    direct_text = None
+                    outcomes = await run_tool_calls(assistant_message.tool_calls)
+                    for function_name, function_args, raw_result, tool_message, _ in outcomes:
+                        if can_render and raw_result is not None and not is_stale_result(raw_result):
+                            direct_text = render(function_name, raw_result, function_args, user_input)
+                        messages.append(tool_message)
+
+                    if direct_text is not None:
+                        # Respuesta formateada localmente: se ahorra la segunda llamada al modelo
+                        render_stats["direct_renders"] += 1
+                        messages.append({"role": "assistant", "content": plain(direct_text)})
+                        console.print(f"\n[bold green]Asistente:[/bold green]\n{direct_text}")
+                        continue
+
+                    # Obtener respuesta final de OpenAI después de usar las herramientas.
+                    # Si se rechazó alguna llamada, el modelo tiene una ronda con todas las
+                    # herramientas para corregir los argumentos; si hay resultados guardados,
+                    # puede paginarlos antes de responder.
+                    retry_available = True
+                    paging_rounds = 0
+                    for _ in range(MAX_PAGING_ROUNDS + 2):
+                        extra_args = {}
+                        allowed_names = None
+                        retrying = retry_available and any(rejected for *_, rejected in outcomes)
+                        if retrying:
+                            retry_available = False
+                            extra_args = {"tools": mcp_tools, "tool_choice": "auto"}
+                        elif result_store.results and paging_rounds < MAX_PAGING_ROUNDS:
+                            paging_rounds += 1
+                            allowed_names = {RESULT_TOOL_NAME}
+                            extra_args = {"tools": [RESULT_TOOL], "tool_choice": "auto"}
+                        final_response = client.chat.completions.create(
+                            model="gpt-4o-mini",
+                            messages=messages,
+                            **extra_args
+                        )
+                    
+                        final_message = final_response.choices[0].message
+                        messages.append(final_message)
+                        if not final_message.tool_calls:
+                            break
+
+                        # Misma validación que en la primera ronda, limitada a lo que se ofreció
+                        for tool_call in final_message.tool_calls:
+                            if retrying:
+                                console.print(f"[dim yellow]  Reintentando {tool_call.function.name}: {tool_call.function.arguments}[/dim yellow]")
+                            elif tool_call.function.name == RESULT_TOOL_NAME:
+                                console.print(f"[dim yellow]  Consultando resultado guardado: {tool_call.function.arguments}[/dim yellow]")
+                        outcomes = await run_tool_calls(final_message.tool_calls, allowed_names)
+                        messages.extend(tool_message for _, _, _, tool_message, _ in outcomes)
                 
-                final_message = final_response.choices[0].message
-                messages.append(final_message)
-                
-                console.print(f"\n[bold green]Asistente:[/bold green] {final_message.content}")
-            else:
-                # Respuesta directa sin herramientas
-                console.print(f"\n[bold green]Asistente:[/bold green] {assistant_message.content}")
+                    console.print(f"\n[bold green]Asistente:[/bold green] {final_message.content}")
+                else:
+                    # Respuesta directa sin herramientas
+                    console.print(f"\n[bold green]Asistente:[/bold green] {assistant_message.content}")
+
+            except Exception as e:
+                console.print(f"[bold red]Error procesando respuesta: {str(e)}[/bold red]")
+                del messages[turn_start:]
+                # No rompemos el bucle, permitimos que el usuario continúe
+    finally:
+        # Cancelar precargas pendientes antes de cerrar las sesiones
+        prefetcher.cancel_pending()
+        result_store.close()
+
+    if hasattr(soccer_session, "stats"):
+        console.print(f"[dim]Réplicas Soccer MCP (pico de {soccer_session.peak_outstanding} llamadas simultáneas): {soccer_session.stats()}[/dim]")
+
+    if render_stats["tool_turns"]:
+        console.print(f"[dim]Turnos con herramientas: {render_stats['tool_turns']} • "
+                      f"llamadas al modelo ahorradas con respuesta directa: {render_stats['direct_renders']} • "
+                      f"plantillas descartadas por la pregunta: {render_stats['declined']}[/dim]")
 
-        except Exception as e:
-            console.print(f"[bold red]Error procesando respuesta: {str(e)}[/bold red]")
-            # No rompemos el bucle, permitimos que el usuario continúe
+    validation_report = tool_validators.report()
+    if validation_report:
+        console.print("[dim]Validación de argumentos:[/dim]")
+        for line in validation_report:
+            console.print(f"[dim]{line}[/dim]")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos de src/ se importan sin paquete, igual que hace app.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,82 @@
+import pytest
+
+from arg_validation import ArgumentValidationError, ToolValidators, compile_schema
+from result_store import RESULT_TOOL, RESULT_TOOL_NAME
+
+TEAM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "team_id": {"type": "integer", "minimum": 1},
+        "season": {"type": ["string", "null"], "default": "2024"},
+        "status": {"type": "string", "enum": ["SCHEDULED", "FINISHED"]},
+    },
+    "required": ["team_id"],
+    "additionalProperties": False,
+}
+
+def test_convierte_tipos_seguros():
+    validator = compile_schema(TEAM_SCHEMA)
+    assert validator({"team_id": "81", "status": "FINISHED"}, "") == {
+        "team_id": 81, "status": "FINISHED", "season": "2024",
+    }
+    assert validator({"team_id": 81.0, "season": 2023}, "") == {"team_id": 81, "season": "2023"}
+
+def test_null_en_opcional_equivale_a_omitirlo():
+    validator = compile_schema(TEAM_SCHEMA)
+    assert validator({"team_id": 81, "season": None}, "") == {"team_id": 81, "season": "2024"}
+
+@pytest.mark.parametrize("args, message", [
+    ({}, "Faltan parámetros obligatorios"),
+    ({"team_id": "Barcelona"}, "'team_id' debe ser de tipo integer"),
+    ({"team_id": 0}, "'team_id' debe ser >= 1"),
+    ({"team_id": 81, "status": "LIVE"}, "'status' debe ser uno de"),
+    ({"team_id": 81, "name": "Barça"}, "Parámetros no permitidos"),
+])
+def test_rechaza_argumentos_invalidos(args, message):
+    with pytest.raises(ArgumentValidationError, match=message):
+        compile_schema(TEAM_SCHEMA)(args, "")
+
+def test_listas_y_rutas_de_error():
+    validator = compile_schema({
+        "type": "object",
+        "properties": {"ids": {"type": "array", "items": {"type": "integer"}}},
+    })
+    assert validator({"ids": ["1", 2]}, "") == {"ids": [1, 2]}
+    with pytest.raises(ArgumentValidationError, match=r"'ids\[1\]'"):
+        validator({"ids": [1, "dos"]}, "")
+
+def test_any_of_acepta_la_primera_alternativa_valida():
+    validator = compile_schema({"anyOf": [{"type": "integer"}, {"type": "string", "maxLength": 3}]})
+    assert validator("12", "x") == 12
+    assert validator("abc", "x") == "abc"
+    with pytest.raises(ArgumentValidationError):
+        validator("abcd", "x")
+
+def test_esquema_vacio_acepta_todo():
+    assert compile_schema(None)({"a": 1}, "") == {"a": 1}
+    assert compile_schema({})("x", "") == "x"
+
+def test_tool_validators_cuenta_rechazos():
+    validators = ToolValidators()
+    validators.add(RESULT_TOOL_NAME, RESULT_TOOL["function"]["parameters"])
+    args, error = validators.validate(RESULT_TOOL_NAME, {"handle": "res_1", "offset": "5"})
+    assert error is None and args["offset"] == 5
+    args, error = validators.validate(RESULT_TOOL_NAME, {"offset": 5})
+    assert "handle" in error and args == {"offset": 5}
+    # Una herramienta sin esquema registrado no se valida
+    assert validators.validate("desconocida", {"x": 1}) == ({"x": 1}, None)
+    assert validators.stats[RESULT_TOOL_NAME]["rejected"] == 1
+    assert len(validators.report()) == 1
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-Infinity", "1e400", float("nan"), float("inf")])
+def test_number_rechaza_valores_no_finitos(value):
+    validator = compile_schema({"type": "object", "properties": {"x": {"type": "number"}}})
+    with pytest.raises(ArgumentValidationError, match="'x' debe ser de tipo number"):
+        validator({"x": value}, "")
+
+def test_number_acepta_texto_numerico():
+    validator = compile_schema({"type": "number"})
+    assert validator("2.5", "x") == 2.5
+    assert validator(3, "x") == 3
+    with pytest.raises(ArgumentValidationError):
+        validator(True, "x")
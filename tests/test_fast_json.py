@@ -0,0 +1,29 @@
+import json
+
+import fast_json
+
+def test_dumps_compacto_y_sin_escapar():
+    assert fast_json.dumps({"equipo": "Atlético", "ids": [1, 2]}) == '{"equipo":"Atlético","ids":[1,2]}'
+
+def test_dumps_refleja_mutaciones():
+    # Codificar, mutar y volver a codificar el mismo objeto no debe devolver el texto anterior
+    result = {"scorers": [{"goals": 10}]}
+    before = fast_json.dumps(result)
+    result["scorers"][0]["goals"] = 11
+    assert fast_json.dumps(result) != before
+    assert json.loads(fast_json.dumps(result))["scorers"][0]["goals"] == 11
+
+def test_dumps_acepta_claves_no_str():
+    assert json.loads(fast_json.dumps({1: "uno"})) == {"1": "uno"}
+
+def test_fragmentos_se_insertan_tal_cual():
+    result = {"name": "FC Barcelona", "founded": 1899}
+    encoded = fast_json.dumps(result)
+    entry = {"tool": "get_team_by_id", "parameters": {"id": 81}, "result": result, "execution_time_ms": 12}
+    line = fast_json.dumps_with_fragments(entry, {"result": encoded})
+    assert encoded in line
+    assert json.loads(line) == entry
+    assert fast_json.dumps_with_fragments(entry, {}) == fast_json.dumps(entry)
+
+def test_loads_acepta_bytes():
+    assert fast_json.loads(b'{"a": 1}') == {"a": 1}
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+
+from prefetch import ToolPrefetcher, is_read_only
+
+REPO_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "mcp_calls.txt")
+
+COMPETITIONS = {"count": 3, "competitions": [{"code": "PL"}, {"code": "CL"}, {"code": "PD"}]}
+TEAM = {"id": 81, "name": "FC Barcelona", "squad": [{"id": 3193, "name": "Pedri"}, {"id": 9999, "name": "Otro"}]}
+
+def write_log(path, calls):
+    with open(path, "w", encoding="utf-8") as f:
+        for i, (tool, params, result) in enumerate(calls):
+            entry = {"timestamp": f"2025-09-09 22:{i:02d}:00", "tool": tool, "parameters": params,
+                     "result": result, "execution_time_ms": 10}
+            f.write(json.dumps(entry) + "\n")
+
+def test_competiciones_predice_equipos_con_codigo_del_resultado(tmp_path):
+    log = tmp_path / "calls.txt"
+    write_log(log, [
+        ("get_competitions", {}, COMPETITIONS),
+        ("get_teams_competitions", {"competition_id": "PD"}, {"teams": []}),
+    ])
+    prefetcher = ToolPrefetcher(log_path=str(log))
+    assert prefetcher.predict("get_competitions", {}, COMPETITIONS) == [
+        ("get_teams_competitions", {"competition_id": "PD"}, 1.0)
+    ]
+    # Si el valor histórico no está en el resultado actual no se inventa nada
+    assert prefetcher.predict("get_competitions", {}, {"competitions": [{"code": "BSA"}, {"code": "SA"}]}) == []
+
+def test_equipo_predice_jugador_de_la_plantilla(tmp_path):
+    log = tmp_path / "calls.txt"
+    write_log(log, [
+        ("get_team_by_id", {"team_id": 81}, TEAM),
+        ("get_player_by_id", {"player_id": 3193}, {"id": 3193}),
+    ])
+    prefetcher = ToolPrefetcher(log_path=str(log))
+    assert prefetcher.predict("get_team_by_id", {"team_id": 81}, TEAM) == [
+        ("get_player_by_id", {"player_id": 3193}, 1.0)
+    ]
+
+def test_parametro_repetido_se_toma_de_la_llamada_anterior(tmp_path):
+    log = tmp_path / "calls.txt"
+    write_log(log, [
+        ("get_teams_competitions", {"competition_id": "PD"}, {"teams": []}),
+        ("get_matches_by_competition", {"competition_id": "PD"}, {"matches": []}),
+    ])
+    prefetcher = ToolPrefetcher(log_path=str(log))
+    assert prefetcher.predict("get_teams_competitions", {"competition_id": "SA"}, {"teams": []}) == [
+        ("get_matches_by_competition", {"competition_id": "SA"}, 1.0)
+    ]
+
+def test_no_repite_argumentos_fijos_de_otras_sesiones(tmp_path):
+    log = tmp_path / "calls.txt"
+    write_log(log, [
+        ("op_get_characters", {}, [{"id": 1}]),
+        ("op_get_character_by_id", {"id": "54"}, {"id": 54}),
+        ("fs_list_directory", {"path": "."}, "[DIR] repo2"),
+        ("fs_read_file", {"path": "repo2/README.md"}, "hola"),
+    ])
+    prefetcher = ToolPrefetcher(log_path=str(log))
+    assert prefetcher.predict("op_get_characters", {}, [{"id": 1}]) == []
+    assert prefetcher.predict("fs_list_directory", {"path": "."}, "[DIR] repo2") == []
+
+def test_no_precarga_herramientas_de_escritura(tmp_path):
+    log = tmp_path / "calls.txt"
+    write_log(log, [("git_status", {}, "ok"), ("git_commit", {}, "ok")])
+    prefetcher = ToolPrefetcher(log_path=str(log))
+    assert not is_read_only("git_commit")
+    assert prefetcher.predict("git_status", {}, "ok") == []
+
+def test_log_real_predice_cadena_de_futbol():
+    prefetcher = ToolPrefetcher(log_path=REPO_LOG)
+    predictions = prefetcher.predict("get_competitions", {}, COMPETITIONS)
+    assert ("get_top_scorers_by_competitions", {"competition_id": "CL"}) in [(t, p) for t, p, _ in predictions]
+
+def test_precarga_se_usa_una_vez_y_se_descarta_tras_escritura(tmp_path):
+    log = tmp_path / "calls.txt"
+    write_log(log, [
+        ("get_teams_competitions", {"competition_id": "PD"}, {"teams": []}),
+        ("get_matches_by_competition", {"competition_id": "PD"}, {"matches": []}),
+    ])
+    calls = []
+
+    async def runner(tool, params):
+        calls.append((tool, params))
+        return {"matches": [len(calls)]}
+
+    async def scenario():
+        prefetcher = ToolPrefetcher(log_path=str(log))
+        prefetcher.schedule("get_teams_competitions", {"competition_id": "PD"}, {"teams": []}, runner)
+        first = await prefetcher.get("get_matches_by_competition", {"competition_id": "PD"})
+        second = await prefetcher.get("get_matches_by_competition", {"competition_id": "PD"})
+
+        prefetcher.schedule("get_teams_competitions", {"competition_id": "PD"}, {"teams": []}, runner)
+        await asyncio.sleep(0)
+        prefetcher.invalidate()
+        third = await prefetcher.get("get_matches_by_competition", {"competition_id": "PD"})
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == {"matches": [1]}
+    assert second is None
+    assert third is None
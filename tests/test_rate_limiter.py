@@ -0,0 +1,96 @@
+import asyncio
+
+from rate_limiter import TokenBucketScheduler, PRIORITY_BATCH, PRIORITY_INTERACTIVE, is_throttling_error
+from result_cache import is_stale_result
+
+def test_from_env_ignora_valores_invalidos(monkeypatch):
+    monkeypatch.setenv("SOCCER_RATE_LIMIT_PER_MINUTE", "diez")
+    monkeypatch.setenv("SOCCER_RATE_BURST", "0")
+    monkeypatch.setenv("SOCCER_RATE_RESERVE", "-3")
+    monkeypatch.setenv("SOCCER_RATE_STALE_TTL_SECONDS", "nunca")
+    limiter = TokenBucketScheduler.from_env()
+    assert limiter.rate == 10 / 60.0
+    assert limiter.capacity == 10
+    assert limiter.reserve == 2
+    assert limiter._cache.ttl_seconds == 900.0
+
+def test_from_env_lee_valores_validos(monkeypatch):
+    monkeypatch.setenv("SOCCER_RATE_LIMIT_PER_MINUTE", "30")
+    monkeypatch.setenv("SOCCER_RATE_BURST", "6")
+    monkeypatch.setenv("SOCCER_RATE_RESERVE", "3")
+    monkeypatch.setenv("SOCCER_RATE_STALE_TTL_SECONDS", "120")
+    limiter = TokenBucketScheduler.from_env()
+    assert (limiter.rate, limiter.capacity, limiter.reserve) == (0.5, 6, 3)
+    assert limiter._cache.ttl_seconds == 120.0
+
+def test_try_acquire_agota_el_burst():
+    limiter = TokenBucketScheduler(rate_per_minute=0.001, burst=3)
+    assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+def test_precarga_no_usa_la_reserva():
+    limiter = TokenBucketScheduler(rate_per_minute=0.001, burst=4, reserve=2)
+    assert limiter.try_acquire_prefetch()
+    assert limiter.try_acquire_prefetch()
+    assert not limiter.try_acquire_prefetch()
+    assert limiter.stats["prefetch_skipped"] == 1
+    # Los tokens reservados siguen disponibles para las preguntas del usuario
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+def test_interactivas_se_atienden_antes_que_lotes():
+    async def scenario():
+        limiter = TokenBucketScheduler(rate_per_minute=600, burst=1)  # un token cada 0,1 s
+        assert limiter.try_acquire()
+        order = []
+
+        async def waiter(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        batch = asyncio.create_task(waiter("lote", PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(waiter("usuario", PRIORITY_INTERACTIVE))
+        await asyncio.gather(batch, interactive)
+        return order
+
+    assert asyncio.run(scenario()) == ["usuario", "lote"]
+
+def test_acquire_devuelve_false_al_expirar():
+    async def scenario():
+        limiter = TokenBucketScheduler(rate_per_minute=0.001, burst=1)
+        limiter.try_acquire()
+        granted = await limiter.acquire(PRIORITY_BATCH, timeout=0.05)
+        return granted, limiter.stats["timeouts"]
+
+    granted, timeouts = asyncio.run(scenario())
+    assert not granted and timeouts == 1
+
+def test_cache_de_respaldo_no_guarda_errores():
+    limiter = TokenBucketScheduler()
+    limiter.remember("get_team_by_id", {"id": 81}, {"name": "FC Barcelona"})
+    limiter.remember("get_team_by_id", {"id": 86}, {"error": "HTTP 429"})
+    stale = limiter.cached("get_team_by_id", {"id": 81})
+    # El respaldo va marcado como antiguo para que el modelo no lo tome como dato actual
+    assert is_stale_result(stale)
+    assert stale["result"] == {"name": "FC Barcelona"}
+    assert len(stale["cached_at"]) == len("2025-01-01 00:00:00")
+    assert limiter.cached("get_team_by_id", {"id": 86}) is None
+    assert limiter.stats["cache_fallbacks"] == 1
+
+def test_cache_de_respaldo_expira(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("result_cache.time.monotonic", lambda: now[0])
+    limiter = TokenBucketScheduler(stale_ttl_seconds=60)
+    limiter.remember("get_matches_by_competition", {"competition": "PD"}, {"matches": []})
+    now[0] += 30
+    assert limiter.cached("get_matches_by_competition", {"competition": "PD"}) is not None
+    now[0] += 31
+    assert limiter.cached("get_matches_by_competition", {"competition": "PD"}) is None
+
+def test_solo_los_errores_de_cuota_cuentan_como_throttling():
+    assert is_throttling_error({"error": "Error al invocar herramienta: HTTP 429 Too Many Requests"})
+    assert is_throttling_error({"error": "You reached your request limit. Rate limit exceeded"})
+    assert not is_throttling_error({"error": "HTTP 404: team not found"})
+    assert not is_throttling_error({"error": "Connection closed"})
+    assert not is_throttling_error({"name": "FC Barcelona"})
@@ -0,0 +1,48 @@
+import pytest
+
+from renderers import RENDERERS, answers_question, render, render_stats
+
+TEAM = {"name": "FC Barcelona", "tla": "FCB", "venue": "Estadi Olímpic", "coach": {"name": "Hansi Flick"}}
+SCORERS = {
+    "competition": {"name": "Primera Division"},
+    "scorers": [{"player": {"name": "Robert Lewandowski"}, "team": {"name": "FC Barcelona"}, "goals": 25}],
+}
+
+def test_get_competitions_no_tiene_plantilla():
+    # La lista completa de competiciones no suele ser la respuesta: la redacta el modelo
+    assert "get_competitions" not in RENDERERS
+
+@pytest.mark.parametrize("question", [
+    "Dame información del Barcelona",
+    "háblame del FC Barcelona",
+    "ficha del equipo 81",
+])
+def test_preguntas_generales_usan_la_plantilla(question):
+    assert answers_question("get_team_by_id", question)
+    assert render("get_team_by_id", TEAM, {"id": 81}, question).startswith("[bold]FC Barcelona[/bold]")
+
+@pytest.mark.parametrize("question", [
+    "¿Cuántos años tiene el estadio del Barça? dame info",
+    "¿Quién entrena al Barcelona?",
+    "datos del Barça comparado con el Madrid",
+    "¿En qué año se fundó el Barcelona?",
+    "info del Barça, solo el entrenador",
+])
+def test_preguntas_concretas_las_responde_el_modelo(question):
+    before = render_stats["declined"]
+    assert render("get_team_by_id", TEAM, {"id": 81}, question) is None
+    assert render_stats["declined"] == before + 1
+
+def test_goleadores():
+    text = render("get_top_scorers_by_competitions", SCORERS, {"competition": "PD"}, "goleadores de La Liga")
+    assert "1. Robert Lewandowski (FC Barcelona) - 25 goles" in text
+    assert render("get_top_scorers_by_competitions", SCORERS, {}, "¿cuántos goles lleva Lewandowski?") is None
+
+def test_errores_y_formas_inesperadas_no_se_renderizan():
+    assert render("get_team_by_id", {"error": "404"}, {}, "info del equipo") is None
+    assert render("get_team_by_id", {"id": 81}, {}, "info del equipo") is None
+    assert render("get_matches_by_competition", {"matches": []}, {}, "lista de partidos") is None
+
+def test_listado_de_directorio_escapa_marcado():
+    text = render("fs_list_directory", "[FILE] [red]notas.txt\n[DIR] logs", {"path": "src"}, "lista los archivos de src")
+    assert "[FILE] \\[red]notas.txt" in text
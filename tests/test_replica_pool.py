@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from replica_pool import Replica, StdioReplicaPool, is_transport_error, replicas_from_env
+
+class ClosedResourceError(Exception):
+    """Mismo nombre que el error de anyio cuando se cierra el canal stdio"""
+
+class FakeSession:
+    def __init__(self, error=None, delay=0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = []
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"tool": name}
+
+def fake_replica(index, session):
+    replica = Replica(index, None)
+    replica.session = session
+    replica.healthy = True
+    # Tarea pendiente que hace de proceso vivo
+    replica._task = asyncio.get_running_loop().create_future()
+    return replica
+
+def fake_pool(*sessions):
+    pool = StdioReplicaPool(lambda: None, len(sessions))
+    pool.replicas = [fake_replica(i, session) for i, session in enumerate(sessions)]
+    return pool
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 1), ("3", 3), ("0", 1), ("-2", 1), ("muchas", 1),
+])
+def test_replicas_from_env(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("SOCCER_MCP_REPLICAS", raising=False)
+    else:
+        monkeypatch.setenv("SOCCER_MCP_REPLICAS", value)
+    assert replicas_from_env() == expected
+
+def test_replicas_from_env_auto(monkeypatch):
+    monkeypatch.setenv("SOCCER_MCP_REPLICAS", "auto")
+    monkeypatch.setattr("replica_pool.os.cpu_count", lambda: 32)
+    assert replicas_from_env() == 8
+
+def test_errores_de_transporte():
+    assert is_transport_error(ClosedResourceError())
+    assert is_transport_error(asyncio.TimeoutError())
+    assert is_transport_error(BrokenPipeError())
+    assert not is_transport_error(ValueError("argumento inválido"))
+
+def test_pick_reparte_por_llamadas_en_curso():
+    async def scenario():
+        sessions = [FakeSession(delay=0.01) for _ in range(3)]
+        pool = fake_pool(*sessions)
+        await asyncio.gather(*(pool.call_tool("get_competitions") for _ in range(6)))
+        return [len(s.calls) for s in sessions], pool.peak_outstanding
+
+    calls, peak = asyncio.run(scenario())
+    assert calls == [2, 2, 2]
+    assert peak == 6
+
+def test_pick_ignora_replicas_caidas():
+    async def scenario():
+        pool = fake_pool(FakeSession(), FakeSession())
+        pool.replicas[0].healthy = False
+        assert pool._pick() is pool.replicas[1]
+        pool.replicas[1]._task.set_result(None)  # El proceso terminó
+        with pytest.raises(RuntimeError):
+            pool._pick()
+
+    asyncio.run(scenario())
+
+def test_error_de_transporte_reinicia_la_replica():
+    async def scenario():
+        pool = fake_pool(FakeSession(error=ClosedResourceError()))
+        replica = pool.replicas[0]
+        restarted = asyncio.Event()
+
+        async def fake_stop():
+            pass
+
+        async def fake_start():
+            replica.session = FakeSession()
+            replica.healthy = True
+            restarted.set()
+
+        replica.stop, replica.start = fake_stop, fake_start
+        with pytest.raises(ClosedResourceError):
+            await pool.call_tool("get_competitions")
+        assert not replica.alive
+        await asyncio.wait_for(restarted.wait(), 1.0)
+        await asyncio.sleep(0)
+        assert replica.restarts == 1 and not pool._restart_tasks
+        assert await pool.call_tool("get_competitions") == {"tool": "get_competitions"}
+
+    asyncio.run(scenario())
+
+def test_error_de_la_herramienta_no_reinicia():
+    async def scenario():
+        pool = fake_pool(FakeSession(error=ValueError("team_id inválido")))
+        with pytest.raises(ValueError):
+            await pool.call_tool("get_team_by_id", {"team_id": "x"})
+        return pool.replicas[0].alive, pool._restart_tasks
+
+    alive, restart_tasks = asyncio.run(scenario())
+    assert alive and not restart_tasks
+
+def test_close_cancela_los_reinicios_pendientes():
+    async def scenario():
+        pool = fake_pool(FakeSession(error=ClosedResourceError()))
+        replica = pool.replicas[0]
+        started = []
+
+        async def slow_stop():
+            await asyncio.sleep(10)
+
+        async def fake_start():
+            started.append(True)
+
+        replica.stop, replica.start = slow_stop, fake_start
+        with pytest.raises(ClosedResourceError):
+            await pool.call_tool("get_competitions")
+        await asyncio.sleep(0)
+        assert len(pool._restart_tasks) == 1
+        replica.stop = lambda: asyncio.sleep(0)
+        await pool.close()
+        await asyncio.sleep(0)
+        # Tras cerrar, ni el reinicio pendiente ni un error nuevo levantan otro proceso
+        pool._schedule_restart(replica)
+        return started, pool._restart_tasks
+
+    started, restart_tasks = asyncio.run(scenario())
+    assert started == [] and not restart_tasks
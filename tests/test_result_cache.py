@@ -0,0 +1,35 @@
+from result_cache import ResultCache, cache_key
+
+def test_clave_no_depende_del_orden_de_parametros():
+    assert cache_key("get_matches", {"a": 1, "b": 2}) == cache_key("get_matches", {"b": 2, "a": 1})
+    assert cache_key("get_matches", None) == cache_key("get_matches", {})
+
+def test_no_guarda_errores():
+    cache = ResultCache()
+    cache.put("get_team_by_id", {"id": 1}, {"error": "HTTP 500"})
+    assert len(cache) == 0
+
+def test_lru_descarta_la_mas_antigua():
+    cache = ResultCache(max_entries=2)
+    for team_id in (1, 2, 3):
+        cache.put("get_team_by_id", {"id": team_id}, {"id": team_id})
+    assert cache.get("get_team_by_id", {"id": 1}) is None
+    assert cache.get("get_team_by_id", {"id": 3}) == {"id": 3}
+
+def test_pop_consume_la_entrada():
+    cache = ResultCache()
+    cache.put("git_status", {}, "limpio")
+    assert cache_key("git_status", {}) in cache
+    assert cache.pop("git_status", {}) == "limpio"
+    assert cache.pop("git_status", {}) is None
+
+def test_expiracion(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("result_cache.time.monotonic", lambda: now[0])
+    cache = ResultCache(ttl_seconds=60)
+    cache.put("get_competitions", {}, {"count": 13})
+    now[0] += 59
+    assert cache.get("get_competitions", {}) == {"count": 13}
+    now[0] += 2
+    assert cache.get("get_competitions", {}) is None
+    assert len(cache) == 0
@@ -0,0 +1,67 @@
+import pytest
+
+from result_store import ResultStore
+
+MATCHES = {
+    "resultSet": {"count": 30},
+    "matches": [{"id": i, "homeTeam": {"name": "FC Barcelona" if i % 3 == 0 else "Girona FC"}, "matchday": i}
+                for i in range(30)],
+}
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(threshold_bytes=200, directory=str(tmp_path))
+    yield store
+    store.close()
+
+def test_resultado_pequeno_no_se_guarda(store):
+    assert store.maybe_spill("get_team_by_id", {"id": 1}) == {"id": 1}
+    assert store.results == {}
+
+def test_resultado_grande_se_reemplaza_por_handle(store):
+    summary = store.maybe_spill("get_matches_by_competition", MATCHES)
+    assert summary["stored_result"] == "res_1"
+    assert summary["total_items"] == 30
+    assert summary["items_key"] == "matches"
+    assert "matchday" in summary["item_fields"]
+
+def test_paginacion(store):
+    handle = store.maybe_spill("get_matches_by_competition", MATCHES)["stored_result"]
+    page = store.read(handle, offset=5, limit=3)
+    assert [m["id"] for m in page["items"]] == [5, 6, 7]
+    assert page["next_offset"] == 8
+    last = store.read(handle, offset=28, limit=10)
+    assert [m["id"] for m in last["items"]] == [28, 29]
+    assert last["next_offset"] is None
+
+def test_offset_y_limit_como_texto(store):
+    handle = store.maybe_spill("get_matches_by_competition", MATCHES)["stored_result"]
+    page = store.read(handle, offset="5", limit="2")
+    assert [m["id"] for m in page["items"]] == [5, 6]
+
+def test_offset_invalido_devuelve_error(store):
+    handle = store.maybe_spill("get_matches_by_competition", MATCHES)["stored_result"]
+    assert "error" in store.read(handle, offset="cinco")
+
+def test_filtro_y_campos(store):
+    handle = store.maybe_spill("get_matches_by_competition", MATCHES)["stored_result"]
+    page = store.read(handle, filter="barcelona", limit=2, fields=["id"])
+    assert page["items"] == [{"id": 0}, {"id": 3}]
+    assert page["next_offset"] == 2
+    following = store.read(handle, filter="barcelona", offset=2, limit=2, fields="id")
+    assert following["items"] == [{"id": 6}, {"id": 9}]
+
+def test_handle_desconocido(store):
+    assert "error" in store.read("res_99")
+
+def test_metadatos_completos_con_field(tmp_path):
+    store = ResultStore(threshold_bytes=200, directory=str(tmp_path))
+    competition = {"id": 2014, "name": "Primera Division", "area": {"name": "Spain", "code": "ESP"}, "emblem": "x" * 200}
+    summary = store.maybe_spill("get_matches_by_competition", dict(MATCHES, competition=competition))
+    # En el resumen el metadato aparece recortado, pero se puede leer completo
+    assert summary["metadata"]["competition"].endswith("…")
+    page = store.read(summary["stored_result"], field="competition")
+    assert page["value"] == competition
+    error = store.read(summary["stored_result"], field="filters")["error"]
+    assert "resultSet" in error and "competition" in error
+    store.close()